@@ -1,3 +1,73 @@
+import functools
+import os
+
+# Try multiple encodings to handle files containing Chinese characters or BOM
+PASSWORD_FILE_ENCODINGS = (
+    "utf-8-sig",  # handles BOM if present
+    "utf-8",
+    "gbk",
+    "gb2312",
+    "big5",
+    "utf-16",
+    "utf-16-le",
+    "utf-16-be",
+)
+
+
+@functools.lru_cache(maxsize=64)
+def _read_password_file(path: str, mtime_ns: int, size: int) -> tuple[str, ...]:
+    """
+    Read the non-empty, trimmed lines of a password file.
+    读取密码文件中非空、去除空白的行。
+
+    The file is read once as bytes and each encoding is tried on those bytes.
+    Results are cached by (path, mtime, size), so the same file loaded for
+    many inputs is parsed once and an edited file is parsed again.
+    """
+    _ = (mtime_ns, size)  # cache key only
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        # File not found or unreadable; nothing to load
+        return ()
+
+    for enc in PASSWORD_FILE_ENCODINGS:
+        try:
+            text = data.decode(enc)
+            break
+        except UnicodeError:
+            # Try next encoding
+            continue
+    else:
+        # Best-effort fallback that ignores decode errors
+        text = data.decode("utf-8", errors="ignore")
+
+    cleaned: list[str] = []
+    for line in text.replace("\r\n", "\n").replace("\r", "\n").split("\n"):
+        token = line.strip().strip("\ufeff")  # remove BOM if any and trim
+        if token:  # skip empty lines
+            cleaned.append(token)
+    return tuple(cleaned)
+
+
+def read_password_file(path: str) -> tuple[str, ...]:
+    """
+    Return the passwords in a file, or an empty tuple if it cannot be read.
+    返回文件中的密码；无法读取时返回空元组。
+
+    Safe to call from worker threads; parsed files are shared via the cache.
+    """
+    try:
+        stat = os.stat(path)
+        return _read_password_file(
+            os.path.abspath(path), stat.st_mtime_ns, stat.st_size
+        )
+    except OSError:
+        # File not found or unreadable; nothing to load
+        return ()
+
+
 class PasswordBook:
     def __init__(self):
         self.local_entries: list[str] = []
@@ -9,50 +79,12 @@ class PasswordBook:
 
     def load_passwords(self, path: str, is_local: bool = False) -> None:
         """Load passwords from a file 从文件加载密码"""
-        # Try multiple encodings to handle files containing Chinese characters or BOM
-        encodings = [
-            "utf-8-sig",  # handles BOM if present
-            "utf-8",
-            "gbk",
-            "gb2312",
-            "big5",
-            "utf-16",
-            "utf-16-le",
-            "utf-16-be",
-        ]
-        content_lines: list[str] = []
-        for enc in encodings:
-            try:
-                with open(path, "r", encoding=enc, errors="strict") as f:
-                    content_lines = f.readlines()
-                break
-            except (OSError, UnicodeError):
-                # Try next encoding
-                content_lines = []
-                continue
-
-        if not content_lines:
-            # Best-effort fallback that ignores decode errors
-            try:
-                with open(path, "r", encoding="utf-8", errors="ignore") as f:
-                    content_lines = f.readlines()
-            except OSError:
-                # File not found or unreadable; nothing to load
-                content_lines = []
-
-        if content_lines:
-            cleaned: list[str] = []
-            for line in content_lines:
-                token = line.strip().strip("\ufeff")  # remove BOM if any and trim
-                if not token:
-                    continue  # skip empty lines
-                cleaned.append(token)
-
-            if cleaned:
-                if is_local:
-                    self.local_entries.extend(cleaned)
-                else:
-                    self.dest_entries.extend(cleaned)
+        cleaned = read_password_file(path)
+        if cleaned:
+            if is_local:
+                self.local_entries.extend(cleaned)
+            else:
+                self.dest_entries.extend(cleaned)
 
         # make sure passwords are unique
         self.local_entries = list(set(self.local_entries))
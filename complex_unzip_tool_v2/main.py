@@ -146,12 +146,12 @@ def _maybe_recover_pending_renames(input_root: str) -> None:
     )
 
 
-def _ask_for_user_input_and_exit() -> None:
+def _ask_for_user_input_and_exit(exit_code: int = 0) -> None:
     """Ask for random user input before exiting the application."""
     # Only ask for input in standalone builds (PyInstaller frozen executables)
     if getattr(sys, "frozen", False):
         input("Press Enter to exit... 按回车键退出...")
-    sys.exit(0)
+    sys.exit(exit_code)
 
 
 @app.callback(invoke_without_command=True)
@@ -170,6 +170,11 @@ def main_callback(
         "-pd",
         help="Permanently delete original files instead of moving to recycle bin 永久删除原始文件而不是移动到回收站",
     ),
+    verbose: bool = typer.Option(
+        False,
+        "--verbose",
+        help="List every skipped multipart continuation file 列出每个跳过的分卷续档",
+    ),
 ) -> None:
     """Complex Unzip Tool v2 - Advanced Archive Extraction Utility 复杂解压工具v2 - 高级档案提取实用程序"""
     if version:
@@ -181,7 +186,9 @@ def main_callback(
     if ctx.invoked_subcommand is None:
         if paths:
             # Call extract_files directly instead of extract command
-            extract_files(paths, use_recycle_bin=not permanent_delete)
+            extract_files(
+                paths, use_recycle_bin=not permanent_delete, verbose=verbose
+            )
         else:
             # Show help when no paths are provided
             print_general(ctx.get_help())
@@ -207,12 +214,19 @@ def extract(
         "-pd",
         help="Permanently delete original files instead of moving to recycle bin 永久删除原始文件而不是移动到回收站",
     ),
+    verbose: bool = typer.Option(
+        False,
+        "--verbose",
+        help="List every skipped multipart continuation file 列出每个跳过的分卷续档",
+    ),
 ) -> None:
     """Extract files from an archive 从档案中提取文件"""
-    extract_files(paths, use_recycle_bin=not permanent_delete)
+    extract_files(paths, use_recycle_bin=not permanent_delete, verbose=verbose)
 
 
-def extract_files(paths: List[str], use_recycle_bin: bool = True) -> None:
+def extract_files(
+    paths: List[str], use_recycle_bin: bool = True, verbose: bool = False
+) -> None:
     """Shared extraction logic 共享提取逻辑"""
 
     # Initialize statistics tracking
@@ -231,6 +245,12 @@ def extract_files(paths: List[str], use_recycle_bin: bool = True) -> None:
     # Recovery: prompt to revert any leftover renames from a crashed run
     _maybe_recover_pending_renames(input_root)
 
+    # Without 7z every archive would only fail as "not a valid archive";
+    # stop before anything is scanned, renamed or created
+    if not archive_utils.seven_zip_available():
+        print_error("7z executable not found 未找到 7z 可执行文件")
+        _ask_for_user_input_and_exit(1)
+
     # Per-run rename history (records every cloaked-file uncloak rename)
     rename_history = RenameHistory(input_root)
 
@@ -380,6 +400,7 @@ def extract_files(paths: List[str], use_recycle_bin: bool = True) -> None:
                     group_relocator=lambda p: bool(
                         file_utils.add_file_to_groups(p, groups)
                     ),
+                    verbose=verbose,
                 )
 
                 loader.stop()
@@ -619,6 +640,7 @@ def extract_files(paths: List[str], use_recycle_bin: bool = True) -> None:
                             group_relocator=lambda p: bool(
                                 file_utils.add_file_to_groups(p, groups)
                             ),
+                            verbose=verbose,
                         )
 
                         retry_loader.stop()
@@ -853,6 +875,7 @@ def extract_files(paths: List[str], use_recycle_bin: bool = True) -> None:
                     group_relocator=lambda p: bool(
                         file_utils.add_file_to_groups(p, groups)
                     ),
+                    verbose=verbose,
                 )
 
                 loader.stop()
@@ -1083,6 +1106,7 @@ def extract_files(paths: List[str], use_recycle_bin: bool = True) -> None:
                             group_relocator=lambda p: bool(
                                 file_utils.add_file_to_groups(p, groups)
                             ),
+                            verbose=verbose,
                         )
 
                         retry_loader.stop()
@@ -57,10 +57,32 @@ def uncloak_archive_filename(filepath: str) -> str | None:
         '1.part2.r删ar' -> '1.part2.rar'
         'ordinary.txt'  -> None
     """
-    clean_path = _uncloakFilename(filepath)
-    if clean_path == filepath:
+    filename = os.path.basename(filepath)
+    clean_filename = _uncloakBasename(filename)
+    if clean_filename == filename:
         return None
-    return os.path.basename(clean_path)
+    return clean_filename
+
+
+# Archive extensions and their common multipart patterns
+_ARCHIVE_PART_PATTERNS = {
+    "7z": [r"\.00[1-9]", r"\.0[1-9][0-9]", r"\.part[0-9]+"],
+    "rar": [r"\.r[0-9]{2}", r"\.part[0-9]+", r"\.00[1-9]"],
+    "zip": [r"\.z[0-9]{2}", r"\.00[1-9]", r"\.part[0-9]+"],
+    "tar": [r"\.part[0-9]+"],
+    "gz": [r"\.part[0-9]+"],
+    "bz2": [r"\.part[0-9]+"],
+    "xz": [r"\.part[0-9]+"],
+    "arj": [r"\.a[0-9]{2}", r"\.part[0-9]+"],
+    "cab": [r"\.part[0-9]+"],
+    "lzh": [r"\.part[0-9]+"],
+    "ace": [r"\.c[0-9]{2}", r"\.part[0-9]+"],
+    "iso": [r"\.part[0-9]+"],
+}
+_ARCHIVE_EXT_RES = {
+    archive_ext: re.compile(re.escape(archive_ext), re.IGNORECASE)
+    for archive_ext in _ARCHIVE_PART_PATTERNS
+}
 
 
 def _uncloakFilename(filepath: str) -> str:
@@ -69,33 +91,24 @@ def _uncloakFilename(filepath: str) -> str:
     Returns the uncloaked filepath.
     """
     filename = os.path.basename(filepath)
-    directory = os.path.dirname(filepath)
+    clean_filename = _uncloakBasename(filename)
+    if clean_filename == filename:
+        return filepath
+    return os.path.join(os.path.dirname(filepath), clean_filename)
 
-    # Archive extensions and their common multipart patterns
-    archive_patterns = {
-        "7z": [r"\.00[1-9]", r"\.0[1-9][0-9]", r"\.part[0-9]+"],
-        "rar": [r"\.r[0-9]{2}", r"\.part[0-9]+", r"\.00[1-9]"],
-        "zip": [r"\.z[0-9]{2}", r"\.00[1-9]", r"\.part[0-9]+"],
-        "tar": [r"\.part[0-9]+"],
-        "gz": [r"\.part[0-9]+"],
-        "bz2": [r"\.part[0-9]+"],
-        "xz": [r"\.part[0-9]+"],
-        "arj": [r"\.a[0-9]{2}", r"\.part[0-9]+"],
-        "cab": [r"\.part[0-9]+"],
-        "lzh": [r"\.part[0-9]+"],
-        "ace": [r"\.c[0-9]{2}", r"\.part[0-9]+"],
-        "iso": [r"\.part[0-9]+"],
-    }
 
+def _uncloakBasename(filename: str) -> str:
+    """
+    Remove cloaking patterns from a bare filename.
+    Returns the filename unchanged if no archive pattern is found, so callers
+    only build paths for names that actually change.
+    """
     # Try to find archive extension in the filename
-    for archive_ext, part_patterns in archive_patterns.items():
+    for archive_ext, part_patterns in _ARCHIVE_PART_PATTERNS.items():
         # Look for the archive extension anywhere in the filename
-        archive_matches = list(
-            re.finditer(re.escape(archive_ext), filename, re.IGNORECASE)
-        )
+        match = _ARCHIVE_EXT_RES[archive_ext].search(filename)
 
-        if archive_matches:
-            match = archive_matches[0]
+        if match:
             start_pos = match.start()
             end_pos = match.end()
 
@@ -109,21 +122,19 @@ def _uncloakFilename(filepath: str) -> str:
             part_extension = _extractPartExtension(suffix, part_patterns)
 
             if part_extension:
-                clean_filename = f"{prefix}{archive_ext}{part_extension}"
-                return os.path.join(directory, clean_filename)
+                return f"{prefix}{archive_ext}{part_extension}"
             else:
                 # No part extension found, just use the archive extension
-                clean_filename = f"{prefix}{archive_ext}"
-                return os.path.join(directory, clean_filename)
+                return f"{prefix}{archive_ext}"
 
     # If no exact match, try flexible matching for heavily cloaked files
-    for archive_ext, part_patterns in archive_patterns.items():
+    for archive_ext, part_patterns in _ARCHIVE_PART_PATTERNS.items():
         clean_filename = _flexibleArchiveMatch(filename, archive_ext, part_patterns)
         if clean_filename and clean_filename != filename:
-            return os.path.join(directory, clean_filename)
+            return clean_filename
 
-    # If no archive pattern found, return original filepath
-    return filepath
+    # If no archive pattern found, return original filename
+    return filename
 
 
 def _extractPartExtension(suffix: str, part_patterns: list[str]) -> str:
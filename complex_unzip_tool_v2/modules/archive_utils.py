@@ -1,8 +1,10 @@
+import functools
 import subprocess
 import os
 import sys
 import shutil
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional, Union, Tuple, Callable
 import re
 from complex_unzip_tool_v2.modules.rich_utils import (
@@ -40,19 +42,52 @@ from complex_unzip_tool_v2.classes.ArchiveTypes import (
     ArchiveFileInfo,
 )
 
+# Multipart primary detection on lowercased basenames, compiled once
+# 多分卷主文件检测（针对小写文件名），只编译一次
+_7Z_VOLUME_RE = re.compile(r"\.7z\.(\d{1,3})$")
+_TAR_VOLUME_RE = re.compile(r"\.tar\.(gz|bz2|xz)\.(\d{1,3})$")
+_RAR_PART_RE = re.compile(r"\.part(\d+)\.rar$")
+_NUMBERED_SPLIT_RE = re.compile(r"\.[a-z0-9]+\.(\d{3,})$")
+# Single-file archives that may be the first part of a multipart set
+# 可能是多分卷集合第一部分的单文件档案
+MULTIPART_PRIMARY_EXTS = (".rar", ".zip", ".zipx", ".arj", ".ace")
+# Concurrent 7z probes when testing extracted files for nested archives. The
+# probes read (possibly large) files from the same disk, so keep it small.
+# 测试提取文件是否为嵌套档案时并行运行的 7z 探测数；探测读取同一磁盘，故保持较小
+ARCHIVE_PROBE_WORKERS = max(1, min(4, (os.cpu_count() or 1) // 2))
+
 # ------------------------------
 # 7-Zip helpers
 # ------------------------------
 
 
-def _resolve_seven_zip_path(seven_zip_path: Optional[str]) -> str:
-    """Return a valid path to 7z.exe, raising if it doesn't exist."""
-    path = seven_zip_path or _get_default_7z_path()
-    if not os.path.exists(path):
+@functools.lru_cache(maxsize=8)
+def _find_seven_zip(path: str) -> str:
+    """Return path if it is an existing file, raising otherwise.
+
+    Found executables are cached, so each is stat'ed once per run; a missing
+    one raises (and is checked again) on every call.
+    已找到的可执行文件会被缓存，每次运行只检查一次；缺失时每次调用都会重新检查。
+    """
+    if not os.path.isfile(path):
         raise SevenZipNotFoundError(f"7z executable not found at: {path}")
     return path
 
 
+def _resolve_seven_zip_path(seven_zip_path: Optional[str]) -> str:
+    """Return a valid path to 7z.exe, raising if it isn't an existing file."""
+    return _find_seven_zip(seven_zip_path or _get_default_7z_path())
+
+
+def seven_zip_available(seven_zip_path: Optional[str] = None) -> bool:
+    """Return True if the 7z executable exists 检查 7z 可执行文件是否存在."""
+    try:
+        _resolve_seven_zip_path(seven_zip_path)
+    except SevenZipNotFoundError:
+        return False
+    return True
+
+
 def _ensure_archive_exists(archive_path: str) -> None:
     """Raise if the given archive path does not exist."""
     if not os.path.exists(archive_path):
@@ -64,6 +99,11 @@ def _build_password_arg(password: Optional[str]) -> str:
     return f"-p{password or ''}"
 
 
+# Fixed arguments of the technical listing command (progress output off)
+# 技术列表命令的固定参数（关闭进度输出）
+_7Z_LIST_ARGS = ("l", "-slt", "-bsp0")
+
+
 def _build_7z_extract_cmd(
     seven_zip_path: str,
     password: Optional[str],
@@ -72,8 +112,18 @@ def _build_7z_extract_cmd(
     overwrite: bool = True,
     specific_files: Optional[List[str]] = None,
 ) -> List[str]:
-    """Build a standardized 7z extract command with consistent argument order."""
-    cmd = [seven_zip_path, "x", _build_password_arg(password), f"-o{output_path}"]
+    """Build a standardized 7z extract command with consistent argument order.
+
+    Progress output is disabled (-bsp0): it is never read, yet every
+    percentage update would be piped back, buffered and decoded.
+    """
+    cmd = [
+        seven_zip_path,
+        "x",
+        _build_password_arg(password),
+        f"-o{output_path}",
+        "-bsp0",
+    ]
 
     if overwrite:
         cmd.append("-y")
@@ -88,14 +138,27 @@ def _build_7z_extract_cmd(
     return cmd
 
 
-def _run_7z_cmd(cmd: List[str]) -> Tuple[str, str, int]:
-    """Run a 7z command returning decoded stdout, stderr and return code."""
+def _build_7z_list_cmd(
+    seven_zip_path: str, password: Optional[str], archive_path: str
+) -> List[str]:
+    """Build the technical-listing (-slt) 7z command parsed by _parse7zListOutput."""
+    return [seven_zip_path, *_7Z_LIST_ARGS, _build_password_arg(password), archive_path]
+
+
+def _run_7z_cmd(cmd: List[str], output_on_success: bool = True) -> Tuple[str, str, int]:
+    """Run a 7z command returning decoded stdout, stderr and return code.
+
+    With output_on_success=False, a successful run returns empty strings
+    instead of decoding output the caller only reads to report errors.
+    """
     result = subprocess.run(
         cmd,
         capture_output=True,
         text=False,
         check=False,
     )
+    if result.returncode == 0 and not output_on_success:
+        return "", "", 0
     stdout, stderr = _decode_subprocess_output(result.stdout, result.stderr)
     return stdout, stderr, result.returncode
 
@@ -172,10 +235,12 @@ def is_valid_archive(
         return False
 
 
+@functools.lru_cache(maxsize=1)
 def _get_default_7z_path() -> str:
     """
     Get the default path to 7z.exe executable.
     Works for both development and PyInstaller standalone builds.
+    The location is fixed for the process, so it is computed once.
     """
     if getattr(sys, "frozen", False):
         # Running in a PyInstaller bundle
@@ -249,6 +314,34 @@ def _decode_subprocess_output(
     return stdout, stderr
 
 
+def _probe_archives(
+    file_paths: List[str],
+    password: Optional[str] = "",
+    seven_zip_path: Optional[str] = None,
+    max_workers: int = ARCHIVE_PROBE_WORKERS,
+) -> List[bool]:
+    """Run is_valid_archive on each file, returning results in input order.
+
+    Each check waits on its own 7z subprocess, so the checks run on a thread
+    pool (1 disables it) and the process startups overlap.
+    每次检查都等待一个 7z 子进程，因此在线程池中并行执行。
+    """
+    if max_workers <= 1 or len(file_paths) <= 1:
+        return [
+            is_valid_archive(path, password=password, seven_zip_path=seven_zip_path)
+            for path in file_paths
+        ]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(file_paths))) as pool:
+        return list(
+            pool.map(
+                lambda path: is_valid_archive(
+                    path, password=password, seven_zip_path=seven_zip_path
+                ),
+                file_paths,
+            )
+        )
+
+
 def readArchiveContentWith7z(
     archive_path: str,
     password: Optional[str] = "",
@@ -284,7 +377,7 @@ def readArchiveContentWith7z(
     _ensure_archive_exists(archive_path)
 
     # Build command
-    cmd = [seven_zip_path, "l", "-slt", _build_password_arg(password), archive_path]
+    cmd = _build_7z_list_cmd(seven_zip_path, password, archive_path)
 
     try:
         stdout, stderr, code = _run_7z_cmd(cmd)
@@ -451,7 +544,7 @@ def extractArchiveWith7z(
     )
 
     try:
-        stdout, stderr, code = _run_7z_cmd(cmd)
+        stdout, stderr, code = _run_7z_cmd(cmd, output_on_success=False)
         try:
             _raise_for_7z_error(code, stderr, archive_path, stdout=stdout)
         except ArchivePasswordError:
@@ -511,7 +604,7 @@ def _extractWithSanitizedPaths(
         )
 
         # Execute extraction to temp directory
-        stdout, stderr, code = _run_7z_cmd(temp_cmd)
+        stdout, stderr, code = _run_7z_cmd(temp_cmd, output_on_success=False)
         if code != 0:
             _raise_for_7z_error(code, stderr, archive_path, stdout=stdout)
 
@@ -724,6 +817,7 @@ def extract_nested_archives(
     active_progress_bars: Optional[List] = None,
     use_recycle_bin: bool = True,
     group_relocator: Optional[Callable[[str], bool]] = None,
+    verbose: bool = False,
 ) -> Dict[str, Union[bool, List[str]]]:
     """
     Recursively extract archives within archives until no more archives are found.
@@ -738,6 +832,8 @@ def extract_nested_archives(
         password_list (List[str], optional): List of passwords to try for extraction
         interactive (bool): Whether to prompt user for passwords when all fail (default: True)
         loading_indicator: Loading indicator instance to stop/start during user prompts
+        verbose (bool): Print every skipped or relocated multipart continuation
+            file instead of one count per extraction level
 
     Returns:
         Dict containing:
@@ -845,25 +941,21 @@ def extract_nested_archives(
     def _is_multipart_primary(file_basename: str) -> bool:
         """Best-effort check for multipart primary candidates."""
         fname = file_basename.lower()
-        if re.search(r"\.7z\.(\d{1,3})$", fname):
-            return bool(re.search(r"\.7z\.(0*1)$", fname))
-        if re.search(r"\.tar\.(gz|bz2|xz)\.(\d{1,3})$", fname):
-            return bool(re.search(r"\.tar\.(gz|bz2|xz)\.(0*1)$", fname))
-        if re.search(r"\.part(\d+)\.rar$", fname):
-            m = re.search(r"\.part(\d+)\.rar$", fname)
-            return bool(m and int(m.group(1)) == 1)
+        m = _7Z_VOLUME_RE.search(fname)
+        if m:
+            return int(m.group(1)) == 1
+        m = _TAR_VOLUME_RE.search(fname)
+        if m:
+            return int(m.group(2)) == 1
+        m = _RAR_PART_RE.search(fname)
+        if m:
+            return int(m.group(1)) == 1
         # 7-Zip generic numbered split of any extension: .001 is the primary.
-        m = re.search(r"\.[a-z0-9]+\.(\d{3,})$", fname)
+        m = _NUMBERED_SPLIT_RE.search(fname)
         if m:
             return int(m.group(1)) == 1
         # .rar/.zip/.zipx/.arj/.ace may be the first part of a multipart set
-        return (
-            fname.endswith(".rar")
-            or fname.endswith(".zip")
-            or fname.endswith(".zipx")
-            or fname.endswith(".arj")
-            or fname.endswith(".ace")
-        )
+        return fname.endswith(MULTIPART_PRIMARY_EXTS)
 
     def _find_matching_candidate_parts(search_root: str, key: str) -> list[str]:
         """Scan search_root for multipart continuation parts matching key."""
@@ -1371,6 +1463,9 @@ def extract_nested_archives(
                 # Find newly extracted archives to process recursively
                 nested_archives = []
                 regular_files = []
+                probe_paths = []
+                relocated_parts = 0
+                skipped_parts = 0
 
                 print_info(
                     f"Testing {len(extracted_files)} extracted files for nested archives",
@@ -1452,10 +1547,13 @@ def extract_nested_archives(
                                 except Exception:
                                     relocated = False
                                 if relocated:
-                                    print_info(
-                                        f"Relocated multipart continuation file 已移动分卷续档: {file_name}",
-                                        3,
-                                    )
+                                    relocated_parts += 1
+                                    if verbose:
+                                        print_info(
+                                            "Relocated multipart continuation "
+                                            f"file 已移动分卷续档: {file_name}",
+                                            3,
+                                        )
                                     # Do not include in nested processing
                                     continue
                             # Record as candidate part for potential matching if a multipart
@@ -1468,19 +1566,43 @@ def extract_nested_archives(
                                 # Maintain a simple list for callers/diagnostics.
                                 result["candidate_multipart_parts"].append(file_path)
                             # Default behavior: skip continuation files inside nested containers
-                            print_info(
-                                f"Skipping multipart continuation file 跳过多部分续档: {file_name}",
-                                3,
-                            )
+                            skipped_parts += 1
+                            if verbose:
+                                print_info(
+                                    "Skipping multipart continuation file "
+                                    f"跳过多部分续档: {file_name}",
+                                    3,
+                                )
                             continue
                     except re.error:
                         # If regex somehow fails, fall back to normal flow
                         pass
 
-                    if is_valid_archive(
-                        file_path, password=password, seven_zip_path=seven_zip_path
-                    ):
-                        print_info(f"📦 Found nested archive 发现嵌套档案: {file_name}", 3)
+                    probe_paths.append(file_path)
+
+                if not verbose:
+                    if relocated_parts:
+                        print_info(
+                            f"Relocated {relocated_parts} multipart continuation "
+                            f"files 已移动 {relocated_parts} 个分卷续档",
+                            3,
+                        )
+                    if skipped_parts:
+                        print_info(
+                            f"Skipped {skipped_parts} multipart continuation "
+                            f"files 跳过 {skipped_parts} 个多部分续档",
+                            3,
+                        )
+
+                # Each probe is a 7z subprocess; run them side by side
+                probe_results = _probe_archives(probe_paths, password, seven_zip_path)
+                for file_path, is_archive in zip(probe_paths, probe_results):
+                    if is_archive:
+                        print_info(
+                            "📦 Found nested archive 发现嵌套档案: "
+                            f"{os.path.basename(file_path)}",
+                            3,
+                        )
                         nested_archives.append(file_path)
                     else:
                         regular_files.append(file_path)
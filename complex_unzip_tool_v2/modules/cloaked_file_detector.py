@@ -3,12 +3,17 @@ Rule-based cloaked file detection and renaming system.
 基于规则的隐藏文件检测和重命名系统。
 """
 
+import copy
+import functools
 import json
 import os
 import re
 import uuid
-from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from enum import Enum
+from typing import Callable, Dict, Final, List, Optional, Tuple, Union
+from dataclasses import dataclass, field
 
 from complex_unzip_tool_v2.modules.rich_utils import (
     print_error,
@@ -20,6 +25,7 @@ from complex_unzip_tool_v2.modules.archive_extension_utils import (
     uncloak_archive_filename,
 )
 from complex_unzip_tool_v2.modules.regex import multipart_regex
+from complex_unzip_tool_v2.modules.rename_history import RenameHistory
 
 # An explicit archive-type token (.7z/.rar/.zip) embedded in a filename means the
 # user deliberately named the file as that archive type; the surrounding garbage
@@ -34,12 +40,282 @@ ARCHIVE_TOKEN_RE = re.compile(
     re.IGNORECASE,
 )
 
+# Names that are already proper and never need uncloaking: multipart forms such
+# as .7z.001 / .part1.rar, and plain single-archive extensions.
+# 已经规范、无需解除隐藏的文件名：多分卷格式和普通单一归档扩展名。
+MULTIPART_RE = re.compile(multipart_regex, re.IGNORECASE)
+# The same check run over many newline-joined names at once ($ = end of line)
+# 对以换行符拼接的多个文件名一次性执行同样的检查（$ 匹配行尾）
+MULTIPART_LINES_RE = re.compile(multipart_regex, re.IGNORECASE | re.MULTILINE)
+PROPER_SINGLE_EXTS = (
+    ".7z",
+    ".rar",
+    ".zip",
+    ".tar",
+    ".tar.gz",
+    ".tgz",
+    ".tar.bz2",
+    ".tbz2",
+    ".tar.xz",
+    ".txz",
+    ".gz",
+    ".bz2",
+    ".xz",
+    ".arj",
+    ".cab",
+    ".lzh",
+    ".lha",
+    ".ace",
+    ".iso",
+    ".img",
+    ".bin",
+)
 
-@dataclass
+# Shape checks applied to groups captured by "filename" rules.
+# 对"filename"类型规则捕获的分组进行格式校验。
+ARCHIVE_TYPE_TOKEN_RE = re.compile(r"^[a-zA-Z0-9]{2,4}$")
+PART_DIGITS_RE = re.compile(r"^\d+$")
+
+
+class _Detection(Enum):
+    """Detection outcomes that are not a path. 非路径的检测结果。"""
+
+    # Default for uncloak_file's detected_path: detection has not run yet
+    # uncloak_file 的 detected_path 默认值：尚未执行检测
+    NOT_DETECTED = "not_detected"
+    # Detection result for a path that does not exist
+    # 路径不存在时的检测结果
+    FILE_MISSING = "file_missing"
+
+
+_NOT_DETECTED: Final = _Detection.NOT_DETECTED
+_FILE_MISSING: Final = _Detection.FILE_MISSING
+
+# Result of _detect_existing: new path, None (not cloaked) or _FILE_MISSING
+DetectionResult = Union[str, None, _Detection]
+
+# Parsed rules per rules file, keyed by path and stamped with the file's
+# (mtime_ns, size) so an edited file is parsed again
+# 按路径缓存已解析的规则，并以文件的 (mtime_ns, size) 标记，文件修改后会重新解析
+_RULES_CACHE: Dict[str, Tuple[Tuple[int, int], List["CloakedFileRule"]]] = {}
+
+# (base_name, original_ext, part_number) produced by a matching rule
+# 匹配规则产生的 (base_name, original_ext, part_number)
+MatchResult = Tuple[str, str, str]
+
+# Index key shared by every extension that starts with a decimal digit.
+# 所有以十进制数字开头的扩展名共享的索引键。
+DIGIT_LEAD_KEY = r"\d"
+
+
+# Characters ending the directory part of a path on this platform; on Windows
+# a drive prefix ("C:name") is split off as well, like ``ntpath.split`` does
+# 本平台上结束目录部分的字符；Windows 上与 ``ntpath.split`` 一样也拆分驱动器前缀
+PATH_SEPARATORS = os.sep + (os.altsep or "") + (":" if os.name == "nt" else "")
+
+
+def split_filename(file_path: str) -> Tuple[str, str]:
+    """
+    Split a path into (directory prefix, filename) with plain string slicing.
+    用简单的字符串切片将路径拆分为 (目录前缀, 文件名)。
+
+    The prefix keeps its trailing separator, so ``prefix + new_name`` is the
+    sibling path ``os.path.join(os.path.dirname(path), new_name)`` points to,
+    without the generic, argument-checking ``os.path`` helpers.
+    """
+    index = -1
+    for separator in PATH_SEPARATORS:
+        index = max(index, file_path.rfind(separator))
+    return file_path[: index + 1], file_path[index + 1 :]
+
+
+def split_extension(filename: str) -> Tuple[str, str]:
+    """
+    Split a filename at its last dot into (name_part, ext_part).
+    在最后一个点处将文件名拆分为 (name_part, ext_part)。
+
+    Unlike ``os.path.splitext`` a leading dot is not special: ``".hidden"``
+    splits into ``("", "hidden")``, which is what the rule patterns expect.
+    """
+    if "." in filename:
+        name_part, ext_part = filename.rsplit(".", 1)
+        return name_part, ext_part
+    return filename, ""
+
+
+def already_proper_names(filenames: List[str]) -> List[bool]:
+    """
+    Flag the filenames that are already proper archive names.
+    标记已经是规范归档名称的文件名。
+
+    Applies the fast-path checks of ``detect_cloaked_file`` to a whole batch:
+    the multipart regex runs once over the newline-joined names instead of
+    once per name.
+
+    Args:
+        filenames: Bare filenames (no directory part)
+
+    Returns:
+        True for every filename that ``detect_cloaked_file`` would leave as is
+        before trying any rule
+    """
+    flags = [filename.lower().endswith(PROPER_SINGLE_EXTS) for filename in filenames]
+    if any("\n" in filename for filename in filenames):
+        return [
+            flag or MULTIPART_RE.search(filename) is not None
+            for flag, filename in zip(flags, filenames)
+        ]
+
+    line_ends = {}
+    offset = -1
+    for index, filename in enumerate(filenames):
+        offset += len(filename) + 1
+        line_ends[offset] = index
+    # The pattern cannot cross a newline, so every match ends on a line end
+    for match in MULTIPART_LINES_RE.finditer("\n".join(filenames)):
+        flags[line_ends[match.end()]] = True
+    return flags
+
+
+def _ext_lead_key(ext_part: str) -> str:
+    """
+    Return the rule-index key for an extension (its first character).
+    返回扩展名对应的规则索引键（其首字符）。
+    """
+    if not ext_part:
+        return ""
+    lead = ext_part[0]
+    return DIGIT_LEAD_KEY if lead.isdecimal() else lead
+
+
+def _compile_proper_format(archive_type: str) -> re.Pattern:
+    """Compile the "file.<type>.<digits>" pattern for one archive type."""
+    return re.compile(rf"^.+\.{re.escape(archive_type)}\.\d+$", re.IGNORECASE)
+
+
+# "Already proper" patterns per archive type, compiled once at import; types
+# only found in custom rule files are compiled on first use.
+# 每种压缩类型的“已是正确格式”模式在导入时编译一次；自定义规则中的类型首次使用时编译。
+PROPER_FORMAT_PATTERNS: Dict[str, re.Pattern] = {
+    archive_type: _compile_proper_format(archive_type)
+    for archive_type in ("7z", "rar", "zip", "tar", "gz")
+}
+
+
+@functools.lru_cache(maxsize=4096)
+def _is_already_proper_format_cached(filename: str, archive_type: str) -> bool:
+    """
+    Cached implementation of ``CloakedFileDetector._is_already_proper_format``.
+    ``CloakedFileDetector._is_already_proper_format`` 的缓存实现。
+    """
+    # Check if filename matches expected format like "file.7z.001"
+    pattern = PROPER_FORMAT_PATTERNS.get(archive_type)
+    if pattern is None:
+        pattern = PROPER_FORMAT_PATTERNS.setdefault(
+            archive_type, _compile_proper_format(archive_type)
+        )
+    return bool(pattern.match(filename))
+
+
+def _split_group_alternatives(body: str, start: int) -> Tuple[List[str], int]:
+    """
+    Split the top-level alternatives of the group opened just before ``start``.
+    拆分在 ``start`` 之前打开的分组中的顶层分支。
+
+    Returns:
+        Tuple of (alternatives, index of the closing parenthesis), or ([], -1)
+        if the group is not closed
+    """
+    alternatives = []
+    depth = 0
+    alt_start = start
+    i = start
+    while i < len(body):
+        char = body[i]
+        if char == "\\":
+            i += 2
+            continue
+        if char == "[":
+            # Skip character classes; they may contain "|" or ")"
+            close = body.find("]", i + 2)
+            if close == -1:
+                return [], -1
+            i = close + 1
+            continue
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            if depth == 0:
+                alternatives.append(body[alt_start:i])
+                return alternatives, i
+            depth -= 1
+        elif char == "|" and depth == 0:
+            alternatives.append(body[alt_start:i])
+            alt_start = i + 1
+        i += 1
+    return [], -1
+
+
+def _is_optional_quantifier(text: str) -> bool:
+    """Check whether ``text`` starts with a quantifier that allows zero repeats."""
+    return text[:1] in ("?", "*") or text.startswith("{0") or text.startswith("{,")
+
+
+def ext_pattern_leads(pattern: str) -> Optional[frozenset]:
+    """
+    Determine which index keys an extension must have to match ``pattern``.
+    确定扩展名必须具有哪些索引键才能匹配 ``pattern``。
+
+    Only simple anchored patterns such as ``^(\\d{3})$`` or ``^(z\\d{2}|\\d{3})$``
+    are analysed; anything else returns None and the rule is evaluated for
+    every extension.
+
+    Args:
+        pattern: The rule's ext_pattern
+
+    Returns:
+        Frozenset of lead keys, or None if the leads cannot be determined
+    """
+    if not pattern.startswith("^"):
+        return None
+    body = pattern[1:]
+
+    if body.startswith("(?:"):
+        alternatives, end = _split_group_alternatives(body, 3)
+    elif body.startswith("(") and not body.startswith("(?"):
+        alternatives, end = _split_group_alternatives(body, 1)
+    elif "|" in body:
+        # A top-level alternation is not covered by the leading anchor
+        return None
+    else:
+        alternatives, end = [body], len(body)
+
+    trailer = body[end + 1 :]
+    if not alternatives or _is_optional_quantifier(trailer) or "|" in trailer:
+        return None
+
+    leads = set()
+    for alternative in alternatives:
+        if alternative.startswith("\\d"):
+            lead, rest = DIGIT_LEAD_KEY, alternative[2:]
+        elif alternative[:1].isalnum():
+            lead, rest = _ext_lead_key(alternative), alternative[1:]
+        else:
+            return None
+        if _is_optional_quantifier(rest):
+            return None
+        leads.add(lead)
+    return frozenset(leads)
+
+
+@dataclass(slots=True)
 class CloakedFileRule:
     """
     Data class representing a cloaked file detection rule.
     表示隐藏文件检测规则的数据类。
+
+    Uses ``__slots__``: rules are read on every file during uncloaking, and
+    slot reads avoid a per-instance ``__dict__``.
     """
 
     name: str
@@ -49,8 +325,21 @@ class CloakedFileRule:
     matching_type: str  # "both", "filename", "ext"
     type: str  # "7z", "rar", "zip", etc.
     enabled: bool
-
-    def __post_init__(self):
+    # Compiled forms of the patterns above, built once at load time
+    # 上述模式的编译形式，在加载时构建一次
+    _filename_re: Optional[re.Pattern] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _ext_re: Optional[re.Pattern] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    # Matcher specialized for this rule's shape, chosen once at load time
+    # 针对该规则形态的匹配函数，在加载时选定一次
+    _match_fn: Optional[Callable[[str, str, str], Optional[MatchResult]]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
         """Validate the rule after initialization."""
         if self.matching_type not in ["both", "filename", "ext"]:
             raise ValueError(f"Invalid matching_type: {self.matching_type}")
@@ -68,6 +357,366 @@ class CloakedFileRule:
         if self.matching_type == "ext" and not self.ext_pattern:
             raise ValueError("ext_pattern required for matching_type 'ext'")
 
+        try:
+            self._filename_re = re.compile(self.filename_pattern)
+            self._ext_re = re.compile(self.ext_pattern or "")
+        except re.error as e:
+            raise ValueError(f"Invalid regex in rule '{self.name}': {e}") from e
+
+        self._match_fn = self._select_match_fn()
+
+    @property
+    def filename_re(self) -> re.Pattern:
+        """
+        Compiled filename_pattern; recompiled if the pattern was reassigned.
+        编译后的 filename_pattern；若模式被重新赋值则重新编译。
+        """
+        # getattr: the slot is unset on rules built without __init__
+        compiled = getattr(self, "_filename_re", None)
+        if compiled is None or compiled.pattern != self.filename_pattern:
+            compiled = self._filename_re = re.compile(self.filename_pattern)
+        return compiled
+
+    @property
+    def ext_re(self) -> re.Pattern:
+        """
+        Compiled ext_pattern; recompiled if the pattern was reassigned.
+        编译后的 ext_pattern；若模式被重新赋值则重新编译。
+        """
+        compiled = getattr(self, "_ext_re", None)
+        if compiled is None or compiled.pattern != self.ext_pattern:
+            compiled = self._ext_re = re.compile(self.ext_pattern)
+        return compiled
+
+    def match(
+        self, filename: str, name_part: str, ext_part: str
+    ) -> Optional[MatchResult]:
+        """
+        Match a filename, already split at its last dot, against this rule.
+        将已在最后一个点处拆分的文件名与此规则匹配。
+
+        Args:
+            filename: The full filename
+            name_part: Text before the last dot (whole filename if none)
+            ext_part: Text after the last dot ("" if none)
+
+        Returns:
+            Tuple of (base_name, original_ext, part_number) if matched, None otherwise
+        """
+        match_fn = getattr(self, "_match_fn", None)
+        if match_fn is None:
+            # Rules built without __post_init__ pick their matcher on first use
+            match_fn = self._match_fn = self._select_match_fn()
+        return match_fn(filename, name_part, ext_part)
+
+    def clone(self) -> "CloakedFileRule":
+        """
+        Copy the rule without validating or compiling its patterns again.
+        复制规则，无需再次校验或编译其模式。
+        """
+        rule = copy.copy(self)
+        rule._match_fn = rule._select_match_fn()
+        return rule
+
+    def _select_match_fn(
+        self,
+    ) -> Callable[[str, str, str], Optional[MatchResult]]:
+        """Pick the matcher for this rule's matching_type and ext_pattern."""
+        if self.matching_type == "both":
+            if self.ext_pattern == "":
+                return self._match_both_extensionless
+            return self._match_both
+        if self.matching_type == "filename":
+            return self._match_filename
+        return self._match_ext
+
+    def _match_both(
+        self, filename: str, name_part: str, ext_part: str
+    ) -> Optional[MatchResult]:
+        """'both' rule with an ext_pattern: filename_pattern checks the name part."""
+        ext_match = self.ext_re.match(ext_part) if ext_part else None
+        if not ext_match:
+            return None
+        filename_match = self.filename_re.match(name_part)
+        if not filename_match:
+            return None
+
+        groups = filename_match.groups()
+        base_name = groups[0] if len(groups) >= 1 else ""
+        original_ext = groups[1] if len(groups) >= 2 else ""
+        part_number = ext_match.group(1) if ext_match.groups() else ""
+        return (base_name, original_ext, part_number)
+
+    def _match_both_extensionless(
+        self, filename: str, name_part: str, ext_part: str
+    ) -> Optional[MatchResult]:
+        """'both' rule with an empty ext_pattern: only files without extension."""
+        if ext_part:
+            return None
+        filename_match = self.filename_re.match(filename)
+        if not filename_match:
+            return None
+
+        groups = filename_match.groups()
+        base_name = groups[0] if len(groups) >= 1 else ""
+        # The part number comes from the filename groups; no original extension
+        part_number = groups[1] if len(groups) >= 2 else ""
+        return (base_name, "", part_number)
+
+    def _match_filename(
+        self, filename: str, name_part: str, ext_part: str
+    ) -> Optional[MatchResult]:
+        """'filename' rule: the pattern is matched against the full filename."""
+        filename_match = self.filename_re.match(filename)
+        if not filename_match:
+            return None
+
+        groups = filename_match.groups()
+        base_name = groups[0] if len(groups) >= 1 else ""
+
+        # Handle different pattern structures with validation
+        if self.type == "auto" and len(groups) >= 3:
+            # Pattern has (base_name, archive_type, part_number)
+            potential_ext = groups[1].strip() if groups[1] else ""
+            potential_part = groups[2].strip() if groups[2] else ""
+
+            # Validate archive type (should be alphanumeric, 2-4 chars typically)
+            if potential_ext and ARCHIVE_TYPE_TOKEN_RE.match(potential_ext):
+                original_ext = potential_ext
+            else:
+                original_ext = self.type
+        elif len(groups) >= 2:
+            # Pattern has (base_name, part_number)
+            potential_part = groups[1].strip() if groups[1] else ""
+            original_ext = self.type  # Use rule type
+        else:
+            # Single group - just base name
+            return (base_name, self.type, "")
+
+        # Validate part number (should be numeric)
+        if potential_part and (
+            potential_part.isdigit() or PART_DIGITS_RE.match(potential_part)
+        ):
+            part_number = potential_part
+        else:
+            part_number = ""
+        return (base_name, original_ext, part_number)
+
+    def _match_ext(
+        self, filename: str, name_part: str, ext_part: str
+    ) -> Optional[MatchResult]:
+        """'ext' rule: only the extension is matched."""
+        ext_match = self.ext_re.match(ext_part) if ext_part else None
+        if not ext_match:
+            return None
+        part_number = ext_match.group(1) if ext_match.groups() else ""
+        return (name_part, "", part_number)
+
+
+# Numbered or named backreferences change meaning once a pattern is embedded
+# in a larger regex, so such patterns are never combined.
+# 嵌入更大的正则后编号或命名反向引用的含义会改变，因此此类模式不会被合并。
+BACKREFERENCE_RE = re.compile(r"\\[1-9]|\(\?P=")
+
+# Anchors and lookarounds that see past the end of a line behave differently
+# once subjects are joined into one newline-separated blob.
+# 当多个主题以换行符拼接成一个文本块后，越过行尾的锚点和环视行为会改变。
+MULTILINE_UNSAFE_RE = re.compile(r"\\[AZ]|\(\?<?[=!]")
+
+
+def _batch_first_groups(
+    gate: Optional[re.Pattern], subjects: List[str]
+) -> Optional[List[Optional[int]]]:
+    """
+    Run a line-anchored union gate once over newline-joined subjects.
+    对以换行符拼接的多个主题只运行一次按行锚定的联合正则。
+
+    Args:
+        gate: ``^(?:...)`` union regex compiled with ``re.MULTILINE``
+        subjects: Strings to match, one per line
+
+    Returns:
+        Index of the first matching rule per subject (None if none matches),
+        or None when the batch result cannot be trusted and every subject
+        has to be matched on its own
+    """
+    results: List[Optional[int]] = [None] * len(subjects)
+    if gate is None or not subjects:
+        return results
+    if any("\n" in subject for subject in subjects):
+        return None
+
+    line_index: Dict[int, int] = {}
+    offset = 0
+    for index, subject in enumerate(subjects):
+        line_index[offset] = index
+        offset += len(subject) + 1
+
+    for match in gate.finditer("\n".join(subjects)):
+        line = line_index.get(match.start())
+        # A match running into the next line (e.g. via [^.]+) may hide that
+        # line's own match, so the whole batch is redone one by one.
+        # Without a named group the rule index is unknown; same fallback
+        if (
+            line is None
+            or match.end() > match.start() + len(subjects[line])
+            or match.lastgroup is None
+        ):
+            return None
+        results[line] = int(match.lastgroup[1:])
+    return results
+
+
+@dataclass
+class RuleBucket:
+    """
+    Candidate rules for one extension lead, with union regexes over them.
+    某个扩展名首字符对应的候选规则及其联合正则表达式。
+
+    ``ext_gate`` alternates the patterns that rules apply to the extension and
+    ``filename_gate`` those applied to the whole filename, one named group per
+    rule in priority order. A single match therefore reveals the first rule
+    that can possibly match, and every rule before it is skipped.
+
+    The ``batch_*`` variants are the same unions anchored per line, so a whole
+    batch of names can be gated with one ``finditer`` call.
+    """
+
+    rules: List[CloakedFileRule]
+    gated: bool = field(default=False, init=False)
+    ext_gate: Optional[re.Pattern] = field(default=None, init=False, repr=False)
+    filename_gate: Optional[re.Pattern] = field(default=None, init=False, repr=False)
+    batch_ext_gate: Optional[re.Pattern] = field(default=None, init=False, repr=False)
+    batch_filename_gate: Optional[re.Pattern] = field(
+        default=None, init=False, repr=False
+    )
+    batch_safe: bool = field(default=False, init=False)
+
+    def __post_init__(self) -> None:
+        """Build the union regexes, or leave the bucket ungated if unsafe."""
+        ext_alternatives: List[str] = []
+        filename_alternatives: List[str] = []
+        for index, rule in enumerate(self.rules):
+            if rule.matching_type == "filename" or rule.ext_pattern == "":
+                pattern, alternatives = rule.filename_pattern, filename_alternatives
+            else:
+                pattern, alternatives = rule.ext_pattern, ext_alternatives
+            if BACKREFERENCE_RE.search(pattern):
+                return
+            alternatives.append(f"(?P<r{index}>{pattern})")
+
+        try:
+            if ext_alternatives:
+                self.ext_gate = re.compile("|".join(ext_alternatives))
+            if filename_alternatives:
+                self.filename_gate = re.compile("|".join(filename_alternatives))
+        except re.error:
+            # e.g. inline global flags or clashing group names
+            self.ext_gate = self.filename_gate = None
+            return
+        self.gated = True
+
+        if any(
+            MULTILINE_UNSAFE_RE.search(alternative)
+            for alternative in ext_alternatives + filename_alternatives
+        ):
+            return
+        if ext_alternatives:
+            self.batch_ext_gate = re.compile(
+                "^(?:" + "|".join(ext_alternatives) + ")", re.MULTILINE
+            )
+        if filename_alternatives:
+            self.batch_filename_gate = re.compile(
+                "^(?:" + "|".join(filename_alternatives) + ")", re.MULTILINE
+            )
+        self.batch_safe = True
+
+    def first_match(
+        self, start: int, filename: str, name_part: str, ext_part: str
+    ) -> Optional[Tuple[int, MatchResult]]:
+        """
+        Find the first rule at or after ``start`` that matches a filename.
+        查找从 ``start`` 起第一条匹配文件名的规则。
+
+        Returns:
+            (index into ``rules``, match result), or None if no rule matches
+        """
+        for index in range(start, len(self.rules)):
+            rule = self.rules[index]
+            # Checked here, not at index time, so toggling a rule takes effect
+            if not rule.enabled:
+                continue
+            result = rule.match(filename, name_part, ext_part)
+            if result:
+                return index, result
+        return None
+
+    def first_viable(self, filename: str, ext_part: str) -> int:
+        """
+        Get the index of the first rule whose primary pattern matches.
+        获取主模式匹配的第一条规则的索引。
+
+        Args:
+            filename: The full filename
+            ext_part: Text after the last dot ("" if none)
+
+        Returns:
+            Index into ``rules``; ``len(rules)`` if no rule can match
+        """
+        if not self.gated:
+            return 0
+        first = len(self.rules)
+        if ext_part and self.ext_gate is not None:
+            match = self.ext_gate.match(ext_part)
+            if match:
+                if match.lastgroup is None:
+                    # Rule index unknown: fall back to the ordered scan
+                    return 0
+                first = int(match.lastgroup[1:])
+        if self.filename_gate is not None:
+            match = self.filename_gate.match(filename)
+            if match:
+                if match.lastgroup is None:
+                    return 0
+                first = min(first, int(match.lastgroup[1:]))
+        return first
+
+    def first_viable_batch(
+        self, filenames: List[str], ext_parts: List[str]
+    ) -> List[int]:
+        """
+        Get ``first_viable`` for many filenames with one scan per gate.
+        对多个文件名计算 ``first_viable``，每个联合正则只扫描一次。
+
+        Args:
+            filenames: The full filenames
+            ext_parts: Text after the last dot of each filename ("" if none)
+
+        Returns:
+            Index into ``rules`` for every filename, as ``first_viable`` gives
+        """
+        if not self.gated:
+            return [0] * len(filenames)
+        if self.batch_safe:
+            ext_firsts = _batch_first_groups(self.batch_ext_gate, ext_parts)
+            name_firsts = _batch_first_groups(self.batch_filename_gate, filenames)
+            if ext_firsts is not None and name_firsts is not None:
+                starts = []
+                for ext_part, ext_first, name_first in zip(
+                    ext_parts, ext_firsts, name_firsts
+                ):
+                    first = len(self.rules)
+                    if ext_part and ext_first is not None:
+                        first = ext_first
+                    if name_first is not None:
+                        first = min(first, name_first)
+                    starts.append(first)
+                return starts
+        return [
+            self.first_viable(filename, ext_part)
+            for filename, ext_part in zip(filenames, ext_parts)
+        ]
+
 
 class CloakedFileDetector:
     """
@@ -84,6 +733,10 @@ class CloakedFileDetector:
             rules_file_path: Path to the JSON file containing rules
         """
         self.rules: List[CloakedFileRule] = []
+        self._rules_by_ext: Dict[str, RuleBucket] = {}
+        self._unkeyed_bucket = RuleBucket([])
+        self._rules_by_name: Dict[str, CloakedFileRule] = {}
+        self._indexed_rules: List[CloakedFileRule] = self.rules
         self.load_rules(rules_file_path)
 
     def load_rules(self, rules_file_path: str) -> None:
@@ -95,10 +748,27 @@ class CloakedFileDetector:
             rules_file_path: Path to the JSON rules file
         """
         try:
-            with open(rules_file_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            stat = os.stat(rules_file_path)
+            stamp = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            stamp = None
+
+        cached = _RULES_CACHE.get(rules_file_path)
+        if stamp is not None and cached is not None and cached[0] == stamp:
+            # Copies share the compiled regexes but not mutable rule state
+            self.rules = [rule.clone() for rule in cached[1]]
+            print_success(f"Loaded {len(self.rules)} rules from {rules_file_path}")
+            self._build_rule_index()
+            return
+
+        try:
+            # Read the whole file as bytes and parse in one pass; json.loads
+            # detects the UTF-8 encoding itself
+            with open(rules_file_path, "rb") as f:
+                data = json.loads(f.read())
 
             self.rules = []
+            names = set()
             for rule_data in data.get("rules", []):
                 rule = CloakedFileRule(
                     name=rule_data["name"],
@@ -109,20 +779,111 @@ class CloakedFileDetector:
                     type=rule_data["type"],
                     enabled=rule_data.get("enabled", True),
                 )
+                if rule.name in names:
+                    # Keep the first rule of that name and the rest of the file
+                    print_warning(f"Skipping duplicate rule name: {rule.name}")
+                    continue
+                names.add(rule.name)
                 self.rules.append(rule)
 
             # Sort rules by priority (higher priority first)
             self.rules.sort(key=lambda r: r.priority, reverse=True)
 
+            # Only cache fully initialized (validated and compiled) rules
+            if stamp is not None and all(
+                rule._match_fn is not None for rule in self.rules
+            ):
+                _RULES_CACHE[rules_file_path] = (
+                    stamp,
+                    [rule.clone() for rule in self.rules],
+                )
+
             print_success(f"Loaded {len(self.rules)} rules from {rules_file_path}")
 
         except Exception as e:
             print_error(f"Failed to load rules from {rules_file_path}: {e}")
             self.rules = []
 
+        self._build_rule_index()
+
+    def _build_rule_index(self) -> None:
+        """
+        Bucket rules by the extension lead they can match.
+        按可匹配的扩展名首字符对规则进行分桶。
+
+        Each bucket keeps the global priority order and already includes the
+        rules that cannot be keyed, so a lookup is a single dict get. Disabled
+        rules are bucketed too: ``enabled`` is checked when matching, so a rule
+        enabled or disabled after loading takes effect without a rebuild.
+        """
+        # (rule, lead keys); None means the rule can match any extension
+        entries: List[Tuple[CloakedFileRule, Optional[frozenset]]] = []
+        for rule in self.rules:
+            if rule.matching_type == "filename":
+                leads = None
+            elif rule.matching_type == "both" and rule.ext_pattern == "":
+                # Only matches files without an extension
+                leads = frozenset({""})
+            else:
+                leads = ext_pattern_leads(rule.ext_pattern)
+            entries.append((rule, leads))
+
+        all_keys = {""}.union(*(leads for _, leads in entries if leads))
+        self._rules_by_ext = {
+            key: RuleBucket(
+                [rule for rule, leads in entries if leads is None or key in leads]
+            )
+            for key in all_keys
+        }
+        self._unkeyed_bucket = RuleBucket(
+            [rule for rule, leads in entries if leads is None]
+        )
+        self._rules_by_name = {rule.name: rule for rule in self.rules}
+        self._indexed_rules = self.rules
+
+    def get_rule(self, name: str) -> Optional[CloakedFileRule]:
+        """
+        Look up a loaded rule by name.
+        按名称查找已加载的规则。
+
+        Args:
+            name: Name of the rule
+
+        Returns:
+            The rule with that name, or None if no such rule is loaded
+        """
+        if self._indexed_rules is not self.rules:
+            self._build_rule_index()
+        return self._rules_by_name.get(name)
+
+    def _candidate_bucket(self, ext_part: str) -> RuleBucket:
+        """
+        Get the bucket of rules that could match an extension.
+        获取可能匹配某扩展名的规则桶。
+
+        Args:
+            ext_part: Extension of the filename (text after the last dot)
+
+        Returns:
+            RuleBucket whose rules are in priority order
+        """
+        if self._indexed_rules is not self.rules:
+            self._build_rule_index()
+        return self._rules_by_ext.get(_ext_lead_key(ext_part), self._unkeyed_bucket)
+
+    def _candidate_rules(self, ext_part: str) -> List[CloakedFileRule]:
+        """
+        Get the rules, in priority order, that could match an extension.
+        获取可能匹配某扩展名的规则（按优先级排序）。
+        """
+        return self._candidate_bucket(ext_part).rules
+
     def _match_rule(
-        self, filename: str, rule: CloakedFileRule
-    ) -> Optional[Tuple[str, str, str]]:
+        self,
+        filename: str,
+        rule: CloakedFileRule,
+        name_parts: Optional[Tuple[str, str]] = None,
+    ) -> Optional[MatchResult]:
         """
         Check if a filename matches a specific rule.
         检查文件名是否匹配特定规则。
@@ -130,6 +891,8 @@ class CloakedFileDetector:
         Args:
             filename: The filename to check
             rule: The rule to match against
+            name_parts: Precomputed ``split_extension(filename)`` result, so
+                callers checking many rules split the filename only once
 
         Returns:
             Tuple of (base_name, original_ext, part_number) if matched, None otherwise
@@ -138,179 +901,79 @@ class CloakedFileDetector:
             return None
 
         # Split filename into name and extension
-        if "." in filename:
-            name_part, ext_part = filename.rsplit(".", 1)
-        else:
-            name_part, ext_part = filename, ""
-
-        base_name = ""
-        part_number = ""
-        original_ext = ""
-
-        if rule.matching_type == "both":
-            # For 'both' type, we need to be careful about what we match against
-            # If the rule expects no extension (empty ext_pattern), match against full filename
-            # Otherwise, match filename_pattern against name_part only
-            if rule.ext_pattern == "":
-                # Rule expects no extension, so match pattern against full filename
-                filename_match = re.match(rule.filename_pattern, filename)
-                ext_match = not ext_part  # True if no extension
-            else:
-                # Rule expects an extension, so match filename pattern against name part
-                filename_match = re.match(rule.filename_pattern, name_part)
-                ext_match = re.match(rule.ext_pattern, ext_part) if ext_part else False
-
-            if filename_match and ext_match:
-                groups = filename_match.groups()
-                if len(groups) >= 1:
-                    base_name = groups[0]
-
-                # For empty ext_pattern, the part number should come from filename groups
-                if rule.ext_pattern == "":
-                    if len(groups) >= 2:
-                        part_number = groups[1]  # Part number from filename pattern
-                    # original_ext stays empty for extensionless files
-                else:
-                    if len(groups) >= 2:
-                        original_ext = groups[1]
-
-                    # Handle part number from extension if ext_pattern is not empty
-                    if isinstance(ext_match, re.Match) and len(ext_match.groups()) >= 1:
-                        part_number = ext_match.group(1)
-
-                return (base_name, original_ext, part_number)
-
-        elif rule.matching_type == "filename":
-            # Match filename pattern only - use full filename for cloaked detection
-            filename_match = re.match(rule.filename_pattern, filename)
-
-            if filename_match:
-                groups = filename_match.groups()
-                if len(groups) >= 1:
-                    base_name = groups[0]
+        name_part, ext_part = name_parts or split_extension(filename)
+        return rule.match(filename, name_part, ext_part)
 
-                # Handle different pattern structures with validation
-                if rule.type == "auto" and len(groups) >= 3:
-                    # Pattern has (base_name, archive_type, part_number)
-                    potential_ext = groups[1].strip() if groups[1] else ""
-                    potential_part = groups[2].strip() if groups[2] else ""
-
-                    # Validate archive type (should be alphanumeric, 2-4 chars typically)
-                    if potential_ext and re.match(r"^[a-zA-Z0-9]{2,4}$", potential_ext):
-                        original_ext = potential_ext
-                    else:
-                        original_ext = rule.type
-
-                    # Validate part number (should be numeric)
-                    if potential_part and (
-                        potential_part.isdigit() or re.match(r"^\d+$", potential_part)
-                    ):
-                        part_number = potential_part
-                    else:
-                        part_number = ""
-
-                elif len(groups) >= 2:
-                    # Pattern has (base_name, part_number)
-                    potential_part = groups[1].strip() if groups[1] else ""
-                    original_ext = rule.type  # Use rule type
-
-                    # Validate part number (should be numeric)
-                    if potential_part and (
-                        potential_part.isdigit() or re.match(r"^\d+$", potential_part)
-                    ):
-                        part_number = potential_part
-                    else:
-                        part_number = ""
-                else:
-                    # Single group - just base name
-                    original_ext = rule.type
-                    part_number = ""
-
-                return (base_name, original_ext, part_number)
-
-        elif rule.matching_type == "ext":
-            # Match extension pattern only
-            ext_match = re.match(rule.ext_pattern, ext_part) if ext_part else None
-
-            if ext_match:
-                base_name = name_part
-                if len(ext_match.groups()) >= 1:
-                    part_number = ext_match.group(1)
-                return (base_name, original_ext, part_number)
-
-        return None
-
-    def detect_cloaked_file(self, file_path: str) -> Optional[str]:
+    def detect_cloaked_file(
+        self,
+        file_path: str,
+        exists: Optional[bool] = None,
+        start: Optional[int] = None,
+    ) -> Optional[str]:
         """
         Detect if a file is cloaked and return the proper filename.
         检测文件是否被隐藏并返回正确的文件名。
 
         Args:
             file_path: Full path to the file
+            exists: Whether the file is already known to exist; checked on
+                demand when None
+            start: First viable rule index precomputed by ``_plan_starts``;
+                computed here when None
 
         Returns:
             New filename with proper extension, or None if no changes needed
         """
-        filename = os.path.basename(file_path)
-        dirname = os.path.dirname(file_path)
+        dir_prefix, filename = split_filename(file_path)
 
-        # Fast-path: skip already proper archive names to avoid unnecessary renames
-        # 1) Proper multipart formats like: .7z.001, .rar.r00, .zip.z01, .tar.gz.001, .part1.rar
-        if re.search(multipart_regex, filename, re.IGNORECASE):
+        # Fast-path: skip already proper archive names before any rule runs
+        # (cheapest check first)
+        # 1) Proper single archive extensions (no cloaking suffixes)
+        if filename.lower().endswith(PROPER_SINGLE_EXTS):
             return None
 
-        # 2) Proper single archive extensions (no cloaking suffixes)
-        proper_single_exts = [
-            ".7z",
-            ".rar",
-            ".zip",
-            ".tar",
-            ".tar.gz",
-            ".tgz",
-            ".tar.bz2",
-            ".tbz2",
-            ".tar.xz",
-            ".txz",
-            ".gz",
-            ".bz2",
-            ".xz",
-            ".arj",
-            ".cab",
-            ".lzh",
-            ".lha",
-            ".ace",
-            ".iso",
-            ".img",
-            ".bin",
-        ]
-        lower_name = filename.lower()
-        if any(lower_name.endswith(ext) for ext in proper_single_exts):
+        # 2) Proper multipart formats like: .7z.001, .rar.r00, .zip.z01, .tar.gz.001, .part1.rar
+        if MULTIPART_RE.search(filename):
             return None
 
-        for rule in self.rules:
-            match_result = self._match_rule(filename, rule)
+        # Rules are sorted by descending priority, so the first rule that
+        # matches and passes verification is the best one: stop there.
+        # Verification only depends on the file and the part number, so a
+        # part number that was already rejected is not verified again.
+        rejected_parts = set()
+        name_parts = split_extension(filename)
+        bucket = self._candidate_bucket(name_parts[1])
+        if start is None:
+            start = bucket.first_viable(filename, name_parts[1])
+        while True:
+            found = bucket.first_match(start, filename, *name_parts)
+            if found is None:
+                break
+            index, (base_name, original_ext, part_number) = found
+            rule = bucket.rules[index]
+            start = index + 1
 
-            if match_result:
-                base_name, original_ext, part_number = match_result
+            # Skip if the file already has the target format
+            if self._is_already_proper_format(filename, rule.type):
+                continue
 
-                # Skip if the file already has the target format
-                if self._is_already_proper_format(filename, rule.type):
-                    continue
+            if part_number in rejected_parts:
+                continue
 
-                # Generate new filename based on rule
-                new_filename = self._generate_new_filename(
-                    base_name, original_ext, part_number, rule, file_path
-                )
+            # Generate new filename based on rule
+            new_filename = self._generate_new_filename(
+                base_name, original_ext, part_number, rule, file_path, exists
+            )
 
-                if new_filename and new_filename != filename:
-                    new_path = os.path.join(dirname, new_filename)
+            if new_filename and new_filename != filename:
+                new_path = dir_prefix + new_filename
 
-                    # Verify the detection with file signature if available
-                    if self._verify_with_signature(file_path, rule.type, part_number):
-                        return new_path
+                # Verify the detection with file signature if available
+                if self._verify_with_signature(file_path, rule.type, part_number):
+                    return new_path
 
-                    # If signature verification fails, continue to next rule
-                    continue
+                # If signature verification fails, continue to next rule
+                rejected_parts.add(part_number)
 
         # Fallback: cloaking characters embedded *inside* the extension or the
         # part-number digits (e.g. "12.7z.0删02", "1.part2.r删ar") cannot be
@@ -319,12 +982,8 @@ class CloakedFileDetector:
         # when the result is an unambiguous multipart/volume form, so ordinary
         # files are never renamed into bogus parts.
         embedded = uncloak_archive_filename(file_path)
-        if (
-            embedded
-            and embedded != filename
-            and re.search(multipart_regex, embedded, re.IGNORECASE)
-        ):
-            return os.path.join(dirname, embedded)
+        if embedded and embedded != filename and MULTIPART_RE.search(embedded):
+            return dir_prefix + embedded
 
         return None
 
@@ -340,9 +999,23 @@ class CloakedFileDetector:
         Returns:
             True if file already has proper format, False otherwise
         """
-        # Check if filename matches expected format like "file.7z.001"
-        pattern = rf"^.+\.{re.escape(archive_type)}\.\d+$"
-        return bool(re.match(pattern, filename, re.IGNORECASE))
+        return _is_already_proper_format_cached(filename, archive_type)
+
+    @classmethod
+    def clear_rules_cache(cls) -> None:
+        """
+        Forget the parsed rules files shared by all detectors.
+        清除所有检测器共享的已解析规则文件缓存。
+        """
+        _RULES_CACHE.clear()
+
+    @staticmethod
+    def clear_cache() -> None:
+        """
+        Clear the memoized filename checks shared by all detectors.
+        清除所有检测器共享的文件名检查缓存。
+        """
+        _is_already_proper_format_cached.cache_clear()
 
     def _generate_new_filename(
         self,
@@ -351,6 +1024,7 @@ class CloakedFileDetector:
         part_number: str,
         rule: CloakedFileRule,
         file_path: str = None,
+        exists: Optional[bool] = None,
     ) -> Optional[str]:
         """
         Generate new filename based on matched rule.
@@ -361,6 +1035,8 @@ class CloakedFileDetector:
             original_ext: Original extension (if any)
             part_number: Part number (if any)
             rule: The matched rule
+            file_path: Path of the file, used to detect "auto" archive types
+            exists: Whether file_path is known to exist; checked when None
 
         Returns:
             New filename or None if cannot generate
@@ -371,6 +1047,8 @@ class CloakedFileDetector:
         # Format part number consistently (pad with zeros if needed)
         if part_number:
             if part_number.isdigit():
+                # zfill is a single C-level call and keeps any extra leading
+                # zeros ("0001" stays "0001"); no int() round-trip needed
                 formatted_part = part_number.zfill(3)  # Pad to 3 digits
             else:
                 formatted_part = part_number
@@ -384,7 +1062,9 @@ class CloakedFileDetector:
         if archive_type == "auto":
             # Try to detect actual archive type from file signature
             try:
-                if file_path and os.path.exists(file_path):
+                if exists is None and file_path:
+                    exists = os.path.exists(file_path)
+                if file_path and exists:
                     detected_type = detect_archive_extension(file_path)
                     if detected_type:
                         archive_type = detected_type
@@ -500,7 +1180,13 @@ class CloakedFileDetector:
         seed = f"{base_dir}|{base_name}"
         return uuid.uuid5(uuid.NAMESPACE_URL, seed).hex[:8]
 
-    def uncloak_file(self, file_path: str, history=None) -> str:
+    def uncloak_file(
+        self,
+        file_path: str,
+        history: Optional[RenameHistory] = None,
+        detected_path: DetectionResult = _NOT_DETECTED,
+        target_exists: Optional[bool] = None,
+    ) -> str:
         """
         Uncloak a single file and rename it if needed.
         解除单个文件的隐藏并在需要时重命名。
@@ -508,17 +1194,29 @@ class CloakedFileDetector:
         Args:
             file_path: Full path to the file to uncloak
             history: Optional RenameHistory to record successful renames
+            detected_path: Result of ``detect_cloaked_file(file_path)`` if it
+                was already computed (e.g. by ``uncloak_files``), in which case
+                the existence check is not repeated
+            target_exists: Whether the rename target is already known to exist
+                (e.g. from a directory listing); checked on demand when None
 
         Returns:
             New file path with proper extension, or original path if no changes needed
         """
-        if not os.path.exists(file_path):
+        if detected_path is _NOT_DETECTED:
+            if not os.path.exists(file_path):
+                return file_path
+            new_path = self.detect_cloaked_file(file_path, exists=True)
+        elif detected_path is _FILE_MISSING:
             return file_path
-
-        new_path = self.detect_cloaked_file(file_path)
+        else:
+            # The existence check already happened during detection
+            new_path = detected_path
 
         if new_path and new_path != file_path:
-            if os.path.exists(new_path):
+            if target_exists is None:
+                target_exists = os.path.exists(new_path)
+            if target_exists:
                 duplicate_path = self._build_collision_path(file_path, new_path)
                 try:
                     os.rename(file_path, duplicate_path)
@@ -552,22 +1250,137 @@ class CloakedFileDetector:
 
         return file_path
 
-    def uncloak_files(self, file_paths: List[str], history=None) -> List[str]:
+    @staticmethod
+    def _listed_exists(path: str, listings: Dict[str, Optional[set]]) -> Optional[bool]:
+        """
+        Look a path up in a once-per-directory listing of casefolded names.
+        在每个目录只列举一次的（casefold 后的）文件名集合中查找路径。
+
+        Args:
+            path: Path whose existence is needed
+            listings: Directory prefix -> names, filled on first use
+
+        Returns:
+            False if the name is certainly absent; None if it may exist (a
+            casefold hit, or a directory that could not be listed), in which
+            case the caller stats the path itself
+        """
+        dir_prefix, name = split_filename(path)
+        if dir_prefix not in listings:
+            try:
+                with os.scandir(dir_prefix or ".") as entries:
+                    listings[dir_prefix] = {entry.name.casefold() for entry in entries}
+            except OSError:
+                listings[dir_prefix] = None
+        names = listings[dir_prefix]
+        if names is None or name.casefold() in names:
+            return None
+        return False
+
+    def _plan_starts(self, file_paths: List[str]) -> List[int]:
+        """
+        Gate a batch of files against their rule buckets in one pass each.
+        对一批文件按规则桶分组，每组只做一次联合正则扫描。
+
+        Args:
+            file_paths: Paths of the files to detect
+
+        Returns:
+            First viable rule index in its bucket for every file
+        """
+        starts = [0] * len(file_paths)
+        by_bucket: Dict[int, Tuple[RuleBucket, List[int], List[str], List[str]]] = {}
+        for index, file_path in enumerate(file_paths):
+            filename = split_filename(file_path)[1]
+            ext_part = split_extension(filename)[1]
+            bucket = self._candidate_bucket(ext_part)
+            entry = by_bucket.setdefault(id(bucket), (bucket, [], [], []))
+            entry[1].append(index)
+            entry[2].append(filename)
+            entry[3].append(ext_part)
+
+        for bucket, indices, filenames, ext_parts in by_bucket.values():
+            for index, start in zip(
+                indices, bucket.first_viable_batch(filenames, ext_parts)
+            ):
+                starts[index] = start
+        return starts
+
+    def _detect_existing(
+        self, file_path: str, start: Optional[int] = None
+    ) -> DetectionResult:
+        """Detect a cloaked file; returns _FILE_MISSING if it does not exist."""
+        if not os.path.exists(file_path):
+            return _FILE_MISSING
+        return self.detect_cloaked_file(file_path, exists=True, start=start)
+
+    def uncloak_files(
+        self,
+        file_paths: List[str],
+        history: Optional[RenameHistory] = None,
+        max_workers: int = 8,
+    ) -> List[str]:
         """
         Uncloak multiple files and return updated paths.
         解除多个文件的隐藏并返回更新的路径。
 
+        Names that are already proper archive names are set aside first, with
+        one regex scan for the whole batch, so they cost no stat and no
+        detection task. The rest are gated against the rules in one regex
+        scan per rule bucket. Detection (name matching and signature reads)
+        then runs on a thread pool. Renames are applied afterwards one by one in input
+        order, because files of one batch may normalize to the same name and
+        the rename history is not thread-safe. Rename targets are checked for
+        conflicts against one listing per directory instead of a stat each.
+        先一次性排除已规范的文件名，再按规则桶对其余文件名做一次正则扫描；
+        检测在线程池中并行执行；
+        重命名随后按输入顺序逐个执行；目标冲突通过每个目录一次的列举检查。
+
         Args:
             file_paths: List of file paths to uncloak
             history: Optional RenameHistory to record successful renames
+            max_workers: Maximum number of detection threads (1 disables the pool)
 
         Returns:
             List of updated file paths with proper extensions
         """
-        updated_paths = []
+        proper = already_proper_names(
+            [split_filename(file_path)[1] for file_path in file_paths]
+        )
+        pending = [index for index, flag in enumerate(proper) if not flag]
+        pending_paths = [file_paths[index] for index in pending]
+        starts = self._plan_starts(pending_paths)
+        if max_workers > 1 and len(pending_paths) > 1:
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                results = list(pool.map(self._detect_existing, pending_paths, starts))
+        else:
+            results = list(map(self._detect_existing, pending_paths, starts))
+
+        # Proper names need no change: the same as detect_cloaked_file's None
+        detected: List[DetectionResult] = [None] * len(file_paths)
+        for index, result in zip(pending, results):
+            detected[index] = result
 
-        for file_path in file_paths:
-            updated_path = self.uncloak_file(file_path, history=history)
+        updated_paths = []
+        listings: Dict[str, Optional[set]] = {}
+
+        for file_path, detected_path in zip(file_paths, detected):
+            target_exists = None
+            if isinstance(detected_path, str) and detected_path != file_path:
+                target_exists = self._listed_exists(detected_path, listings)
+            updated_path = self.uncloak_file(
+                file_path,
+                history=history,
+                detected_path=detected_path,
+                target_exists=target_exists,
+            )
+            if updated_path != file_path:
+                # Keep the listing current for later files of the batch; the
+                # old name is left in place, a stale hit only costs a stat
+                dir_prefix, name = split_filename(updated_path)
+                names = listings.get(dir_prefix)
+                if names is not None:
+                    names.add(name.casefold())
             updated_paths.append(updated_path)
 
         return updated_paths
@@ -580,19 +1393,40 @@ class CloakedFileDetector:
         Returns:
             Dictionary containing rule statistics and details
         """
-        enabled_rules = [r for r in self.rules if r.enabled]
-        disabled_rules = [r for r in self.rules if not r.enabled]
+        return self._compute_rule_info()
+
+    def _compute_rule_info(self) -> Dict:
+        """
+        Aggregate rule statistics in a single pass over the rules.
+        单次遍历规则以汇总规则统计信息。
+        """
+        if not self.rules:
+            return {
+                "total_rules": 0,
+                "enabled_rules": 0,
+                "disabled_rules": 0,
+                "rules_by_type": {},
+                "highest_priority": 0,
+                "lowest_priority": 0,
+            }
+
+        rules_by_type: Counter = Counter()
+        enabled = 0
+        highest = lowest = self.rules[0].priority
+        for rule in self.rules:
+            if rule.enabled:
+                enabled += 1
+                rules_by_type[rule.type] += 1
+            if rule.priority > highest:
+                highest = rule.priority
+            elif rule.priority < lowest:
+                lowest = rule.priority
 
         return {
             "total_rules": len(self.rules),
-            "enabled_rules": len(enabled_rules),
-            "disabled_rules": len(disabled_rules),
-            "rules_by_type": {
-                rule_type: len([r for r in enabled_rules if r.type == rule_type])
-                for rule_type in set(r.type for r in enabled_rules)
-            },
-            "highest_priority": (
-                max(r.priority for r in self.rules) if self.rules else 0
-            ),
-            "lowest_priority": min(r.priority for r in self.rules) if self.rules else 0,
+            "enabled_rules": enabled,
+            "disabled_rules": len(self.rules) - enabled,
+            "rules_by_type": dict(rules_by_type),
+            "highest_priority": highest,
+            "lowest_priority": lowest,
         }
@@ -1,8 +1,8 @@
 OUTPUT_FOLDER = "unzipped"
 
-# Files to ignore when scanning directories
-# 扫描目录时忽略的文件
-IGNORED_FILES = {".DS_Store", "thumbs.db", "desktop.ini", "passwords.txt"}
+# Files to ignore when scanning directories, matched on the lowercased name
+# 扫描目录时忽略的文件，按小写文件名匹配
+IGNORED_FILES = frozenset({".ds_store", "thumbs.db", "desktop.ini", "passwords.txt"})
 
 
 # Multi-part archive patterns for detecting split archives
@@ -1,7 +1,10 @@
+import functools
 import os
 import re
 import shutil
-from send2trash import send2trash
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
 
 from complex_unzip_tool_v2.modules.const import (
     MULTI_PART_PATTERNS,
@@ -13,11 +16,59 @@ from complex_unzip_tool_v2.modules.utils import get_string_similarity
 from complex_unzip_tool_v2.modules.cloaked_file_detector import CloakedFileDetector
 from complex_unzip_tool_v2.modules.regex import multipart_regex
 
+# Filesystem mutators, called through module attributes so tests can swap in
+# a replacement here instead of patching os/shutil for the whole process
+# 文件系统操作通过模块属性调用，测试可在此替换而无需全局修补 os/shutil
+_replace = os.replace
+_rename = os.rename
+_remove = os.remove
+_move = shutil.move
+
+# Bundled cloaked-file rules; resolved once at import (abspath reads the cwd)
+# 内置的隐藏文件规则，导入时解析一次（abspath 需要读取当前目录）
+DEFAULT_CLOAKED_RULES_FILE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "config",
+    "cloaked_file_rules.json",
+)
 
 _MEANINGLESS_OUTPUT_FOLDER_ALLOWED_CHARS_RE = re.compile(
     r"^[0-9\+\-_\.,\(\)\[\]\{\}!@#\$%\^&=]+$"
 )
 _DATE_LIKE_FOLDER_RE = re.compile(r"^\d{4}-\d{1,2}-\d{1,2}$")
+_LATIN_LETTER_RE = re.compile(r"[A-Za-z]")
+_CJK_CHAR_RE = re.compile(r"[\u4e00-\u9fff]")
+
+# Archive name patterns, compiled once at import instead of on every call
+# 档案名称模式，在导入时编译一次，而不是每次调用时编译
+_MULTIPART_RE = re.compile(multipart_regex)
+_MULTI_PART_RES = [
+    re.compile(pattern, re.IGNORECASE) for pattern in MULTI_PART_PATTERNS
+]
+_ZIPX_CONTINUATION_RE = re.compile(r"\.zx\d{2}$", re.IGNORECASE)
+_ZIP_CONTINUATION_RE = re.compile(r"\.z\d{2}$", re.IGNORECASE)
+_RAR_CONTINUATION_RE = re.compile(r"\.r\d{2}$", re.IGNORECASE)
+_ARJ_CONTINUATION_RE = re.compile(r"\.a\d{2}$", re.IGNORECASE)
+_ACE_CONTINUATION_RE = re.compile(r"\.c\d{2}$", re.IGNORECASE)
+_RAR_PART_SUFFIX_RE = re.compile(r"\.part\d+\.rar$", re.IGNORECASE)
+_RAR_PART_NOTATION_RE = re.compile(r"^(.*)\.part(\d+)\.rar$", re.IGNORECASE)
+_GENERIC_NUMBERED_SPLIT_RE = re.compile(r"\.([A-Za-z0-9]+)\.\d{3,}$")
+_7Z_FIRST_PART_RE = re.compile(r"\.7z\.(0*1)$")
+_TAR_FIRST_PART_RE = re.compile(r"\.tar\.(gz|bz2|xz)\.(0*1)$")
+_RAR_FIRST_PART_RE = re.compile(r"\.part1\.rar$")
+_GENERIC_FIRST_PART_RE = re.compile(r"\.[a-z0-9]+\.0{2,}1$")
+
+# Family-mapped continuation suffixes: all parts must share the family ext
+# so grouping/comparison treats them as the same multi-part set.
+# Note: .zx must be checked before .z so `.zx01` maps to zipx, not zip.
+_FAMILY_PATTERNS = [
+    (_ZIPX_CONTINUATION_RE, "zipx"),  # .zx01, .zx02 → zipx family
+    (_ZIP_CONTINUATION_RE, "zip"),  # .z01, .z02 → zip family
+    (_RAR_CONTINUATION_RE, "rar"),  # .r00, .r01 → rar family
+    (_ARJ_CONTINUATION_RE, "arj"),  # .a01, .a02 → arj family
+    (_ACE_CONTINUATION_RE, "ace"),  # .c00, .c01 → ace family
+    (_RAR_PART_SUFFIX_RE, "rar"),  # .part1.rar, .part2.rar → rar family
+]
 
 
 def _is_meaningless_output_folder_name(folder_name: str) -> bool:
@@ -39,9 +90,9 @@ def _is_meaningless_output_folder_name(folder_name: str) -> bool:
         return False
 
     # Must not contain letters or CJK characters
-    if re.search(r"[A-Za-z]", name):
+    if _LATIN_LETTER_RE.search(name):
         return False
-    if re.search(r"[\u4e00-\u9fff]", name):
+    if _CJK_CHAR_RE.search(name):
         return False
 
     # Only allow digits plus specific symbols
@@ -78,6 +129,7 @@ def normalize_output_relative_path(relative_path: str) -> str:
     return filename
 
 
+@functools.lru_cache(maxsize=4096)
 def get_archive_base_name(file_path: str) -> tuple[str, str]:
     """
     Get the base name and archive extension from a file path,
@@ -90,28 +142,21 @@ def get_archive_base_name(file_path: str) -> tuple[str, str]:
     standard RAR), the returned extension is the *family* extension (zip/rar)
     so that all parts of the same set share the same (base, ext) tuple. This
     is what enables grouping logic to recognize them as related.
+
+    Results are memoized: grouping compares every file with every group, so
+    the same paths are parsed over and over otherwise.
     """
     base_name = os.path.basename(file_path)
 
-    # Family-mapped continuation suffixes: all parts must share the family ext
-    # so grouping/comparison treats them as the same multi-part set.
-    # Note: .zx must be checked before .z so `.zx01` maps to zipx, not zip.
-    family_pattern_map = [
-        (r"\.zx\d{2}$", "zipx"),  # .zx01, .zx02 → zipx family
-        (r"\.z\d{2}$", "zip"),  # .z01, .z02 → zip family
-        (r"\.r\d{2}$", "rar"),  # .r00, .r01 → rar family
-        (r"\.a\d{2}$", "arj"),  # .a01, .a02 → arj family
-        (r"\.c\d{2}$", "ace"),  # .c00, .c01 → ace family
-        (r"\.part\d+\.rar$", "rar"),  # .part1.rar, .part2.rar → rar family
-    ]
-    for pattern, family_ext in family_pattern_map:
-        match = re.search(pattern, base_name, re.IGNORECASE)
+    # Family-mapped continuation suffixes first (see _FAMILY_PATTERNS)
+    for pattern, family_ext in _FAMILY_PATTERNS:
+        match = pattern.search(base_name)
         if match:
             return base_name[: match.start()], family_ext
 
     # Use the multi-part archive patterns from constants
-    for pattern in MULTI_PART_PATTERNS:
-        match = re.search(pattern, base_name, re.IGNORECASE)
+    for pattern in _MULTI_PART_RES:
+        match = pattern.search(base_name)
         if match:
             # Remove the part number/suffix to get the base name
             name_without_part = base_name[: match.start()]
@@ -124,7 +169,7 @@ def get_archive_base_name(file_path: str) -> tuple[str, str]:
     # (zero-padded, 3+ digits). Checked AFTER the specific patterns above so 7z/zip/
     # tar split parsing is preserved; covers .rar.001, .iso.001, plain .tar.001, etc.
     # The token immediately before the numeric run is the shared family extension.
-    generic_match = re.search(r"\.([A-Za-z0-9]+)\.\d{3,}$", base_name)
+    generic_match = _GENERIC_NUMBERED_SPLIT_RE.search(base_name)
     if generic_match:
         return base_name[: generic_match.start()], generic_match.group(1)
 
@@ -133,25 +178,95 @@ def get_archive_base_name(file_path: str) -> tuple[str, str]:
     return name, ext.lstrip(".")
 
 
-def read_dir(file_paths: list[str]) -> list[str]:
-    """Read directory contents 读取目录内容"""
-    result = []
+def _default_scan_workers() -> int:
+    """Thread count for directory scans; I/O bound, so above the CPU count."""
+    return min(32, (os.cpu_count() or 1) * 4)
+
+
+def _scan_one_dir(directory: str) -> tuple[list[str], list[str]]:
+    """
+    List one directory into (files, subdirectories to descend into).
+    列出单个目录，返回 (文件, 需要继续遍历的子目录)。
+
+    Uses os.scandir so the file/directory split comes from the directory
+    listing itself instead of a stat per entry. Like os.walk, symlinked
+    directories are not descended into and unreadable directories are skipped.
+    """
+    files: list[str] = []
+    subdirs: list[str] = []
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if is_dir:
+                    # Skip the output folder and any subdirectories within it
+                    if entry.name != OUTPUT_FOLDER and not entry.is_symlink():
+                        subdirs.append(entry.path)
+                elif entry.name.lower() not in IGNORED_FILES:
+                    files.append(entry.path)
+    except OSError:
+        pass
+    return files, subdirs
+
+
+def _scan_dir_files(root: str, result: list[str], max_workers: int) -> None:
+    """
+    Append all files below root to result, one directory level at a time.
+    逐层将 root 下的所有文件追加到 result。
+
+    Each level's directories are listed concurrently on a thread pool so
+    listing latency overlaps; the pool is only started once root turns out
+    to have subdirectories.
+    """
+    files, pending = _scan_one_dir(root)
+    result.extend(files)
+    if not pending:
+        return
+
+    if max_workers <= 1:
+        while pending:
+            files, subdirs = _scan_one_dir(pending.pop())
+            result.extend(files)
+            pending.extend(subdirs)
+        return
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        while pending:
+            next_level: list[str] = []
+            for files, subdirs in pool.map(_scan_one_dir, pending):
+                result.extend(files)
+                next_level.extend(subdirs)
+            pending = next_level
+
+
+def read_dir(file_paths: list[str], max_workers: int | None = None) -> list[str]:
+    """Read directory contents 读取目录内容
+
+    Args:
+        file_paths: Files and directories to read
+        max_workers: Threads used to list subdirectories (1 scans serially);
+            defaults to four per CPU, at most 32
+
+    Returns:
+        Unique file paths, directories expanded recursively
+    """
+    if max_workers is None:
+        max_workers = _default_scan_workers()
+    result: list[str] = []
 
     # Use ignored files from constants
     for path in file_paths:
+        path = os.fspath(path)
         if os.path.isdir(path):
             # Read files from directory
-            for root, dirs, files in os.walk(path):
-                # Skip the output folder and any subdirectories within it
-                dirs[:] = [d for d in dirs if d != OUTPUT_FOLDER]
-
-                for filename in files:
-                    if filename not in IGNORED_FILES:
-                        result.append(os.path.join(root, filename))
+            _scan_dir_files(path, result, max_workers)
         else:
             # Check if the file is ignored
             basename = os.path.basename(path)
-            if basename not in IGNORED_FILES:
+            if basename.lower() not in IGNORED_FILES:
                 result.append(path)
 
     # make sure the result is unique
@@ -164,6 +279,10 @@ def rename_file(old_path: str, new_path: str, error_callback=None) -> bool:
     For example, "old_name.txt" to "new_name.txt"
     例如："old_name.txt" 到 "new_name.txt"
 
+    Uses os.replace, so an existing target file is replaced atomically on
+    every platform instead of failing on Windows.
+    使用 os.replace，在所有平台上原子地替换已存在的目标文件。
+
     Args:
         old_path: Original path
         new_path: New path
@@ -173,7 +292,7 @@ def rename_file(old_path: str, new_path: str, error_callback=None) -> bool:
         bool: True if successful, False otherwise
     """
     try:
-        os.rename(old_path, new_path)
+        _replace(old_path, new_path)
         return True
     except (OSError, IOError, PermissionError) as e:
         error_msg = f"Error renaming file 重命名文件错误 {old_path} to {new_path}: {e}"
@@ -200,10 +319,14 @@ def safe_remove(
     try:
         if os.path.exists(file_path):
             if use_recycle_bin:
+                # Imported on first use: send2trash pulls in platform
+                # trash/COM bindings that permanent deletes never need
+                from send2trash import send2trash
+
                 send2trash(file_path)
                 return True
             else:
-                os.remove(file_path)
+                _remove(file_path)
                 return True
         return False
     except (OSError, IOError, PermissionError, FileNotFoundError) as e:
@@ -229,59 +352,53 @@ def _should_group_files(
     base1, ext1 = get_archive_base_name(file_path1)
     base2, ext2 = get_archive_base_name(file_path2)
 
-    # First check: Are they multipart archives of the same base file?
-    if _are_multipart_related(file_path1, file_path2):
-        return True
+    # Every check below requires the same archive family/extension. Without
+    # that guard, unrelated archive types that merely share a base name (e.g.
+    # foo.7z and foo.zip) would be merged into one group. That corrupts
+    # handling — e.g. a standalone .7z swept into a spanned .zip set gets
+    # deleted with the set instead of being extracted on its own.
+    if ext1 != ext2:
+        return False
 
-    # Second check: Exact base name match (for files like 1.rar, 1.r00, 1.r01)
-    # But only if they're in the same directory (to avoid grouping identical files from different folders)
-    if base1 == base2 and ext1 == ext2:
-        # Check if they're in the same directory
-        dir1 = os.path.dirname(file_path1)
-        dir2 = os.path.dirname(file_path2)
-        if dir1 == dir2:
+    if base1 == base2:
+        # Exact base name match (for files like 1.rar, 1.r00, 1.r01), but only
+        # in the same directory to avoid grouping identical files from
+        # different folders...
+        if os.path.dirname(file_path1) == os.path.dirname(file_path2):
+            return True
+        # ...unless they are multipart archives of the same base file
+        if _are_multipart_related(file_path1, file_path2):
             return True
 
-    # Third check: Only allow grouping if similarity is very high AND they share
-    # exact base name AND same directory AND the same archive family/extension.
-    # The extension guard is essential: without it, unrelated archive types that
-    # merely share a base name (e.g. foo.7z and foo.zip) would be merged into one
-    # group. That corrupts handling — e.g. a standalone .7z swept into a spanned
-    # .zip set gets deleted with the set instead of being extracted on its own.
-    similarity = get_string_similarity(group_name1, group_name2)
-    if similarity >= 0.95:
-        # Extract directory and filename parts
-        dir1 = group_name1.split("-")[0] if "-" in group_name1 else ""
-        dir2 = group_name2.split("-")[0] if "-" in group_name2 else ""
-        name1_only = group_name1.split("-")[-1] if "-" in group_name1 else group_name1
-        name2_only = group_name2.split("-")[-1] if "-" in group_name2 else group_name2
-
-        # Only group if the file base names are identical AND they're in the same
-        # directory AND they belong to the same archive family/extension.
-        return name1_only == name2_only and dir1 == dir2 and ext1 == ext2
-
-    # For all other cases, don't group
-    return False
+    # Last check: the file base names are identical AND they're in the same
+    # directory (per the group name tokens) AND similarity is very high. The
+    # token comparison is the cheap part, so it runs first, and identical
+    # group names (similarity 1.0) need no scoring at all.
+    if _group_name_tokens(group_name1) != _group_name_tokens(group_name2):
+        return False
+    if group_name1 == group_name2:
+        return True
+    return get_string_similarity(group_name1, group_name2, min_ratio=0.95) >= 0.95
 
 
 def _are_multipart_related(file_path1: str, file_path2: str) -> bool:
-    """Check if two files are related multipart archives."""
+    """Check if two files are related multipart archives.
+
+    The part-suffix check runs first, on the bare filename, so base names are
+    only parsed (and then served from get_archive_base_name's cache) for
+    pairs that are both multipart.
+    """
     if not file_path2:  # Empty comparison file
         return False
 
-    # Extract base names without part numbers
-    base1, ext1 = get_archive_base_name(file_path1)
-    base2, ext2 = get_archive_base_name(file_path2)
-
-    # Check if both are multipart archives with identical base names
-    file1_is_multipart = re.search(multipart_regex, file_path1)
-    file2_is_multipart = re.search(multipart_regex, file_path2)
-
-    if file1_is_multipart and file2_is_multipart:
-        # Base names must be exactly the same for multipart grouping
-        return base1 == base2 and ext1 == ext2
+    # Both must be multipart archives...
+    if not _MULTIPART_RE.search(os.path.basename(file_path1)):
+        return False
+    if not _MULTIPART_RE.search(os.path.basename(file_path2)):
+        return False
 
-    return False
+    # ...with exactly the same (base name, extension)
+    return get_archive_base_name(file_path1) == get_archive_base_name(file_path2)
 
 
 def _have_matching_multipart_pattern(file_path1: str, file_path2: str) -> bool:
@@ -302,19 +419,42 @@ def _have_matching_multipart_pattern(file_path1: str, file_path2: str) -> bool:
     return False
 
 
+def _group_name_tokens(group_name: str) -> tuple[str, str]:
+    """(directory token, name token) compared by the similarity check of
+    _should_group_files."""
+    if "-" not in group_name:
+        return "", group_name
+    parts = group_name.split("-")
+    return parts[0], parts[-1]
+
+
 def create_groups_by_name(file_paths: list[str]) -> list[ArchiveGroup]:
-    """Create Archive Groups by name 按名称创建档案组"""
+    """Create Archive Groups by name 按名称创建档案组
+
+    Every rule of _should_group_files requires the same archive extension and
+    either the same base name or the same name tokens, so groups are indexed
+    by those keys and a file is only compared with the groups sharing one.
+    Candidates are still tried in creation order, exactly like a full scan.
+    按键索引档案组，文件只与共享键的组比较，仍按创建顺序尝试。
+    """
     groups: list[ArchiveGroup] = []
+    groups_by_base: dict[tuple[str, str], list[int]] = {}
+    groups_by_tokens: dict[tuple[str, str, str], list[int]] = {}
 
     for path in file_paths:
         # get base name and directory name using the new function
-        base_name, _ = get_archive_base_name(path)
+        base_name, ext = get_archive_base_name(path)
         dir_name = os.path.dirname(path).split(os.path.sep)[-1]
         group_name = f"{dir_name}-{base_name}"
+        base_key = (base_name, ext)
+        tokens_key = (*_group_name_tokens(group_name), ext)
 
         # Check if file belongs to an existing group using improved logic
         found_group = False
-        for group in groups:
+        candidates = set(groups_by_base.get(base_key, ()))
+        candidates.update(groups_by_tokens.get(tokens_key, ()))
+        for index in sorted(candidates):
+            group = groups[index]
             if _should_group_files(
                 group_name, group.name, path, group.files[0] if group.files else ""
             ):
@@ -325,6 +465,8 @@ def create_groups_by_name(file_paths: list[str]) -> list[ArchiveGroup]:
         if not found_group:
             new_group = ArchiveGroup(group_name)
             new_group.add_file(path)
+            groups_by_base.setdefault(base_key, []).append(len(groups))
+            groups_by_tokens.setdefault(tokens_key, []).append(len(groups))
             groups.append(new_group)
 
     # and finally sort it by name
@@ -351,9 +493,7 @@ def uncloak_file_extension_for_groups(
     """
     # Use default rules file if not provided
     if rules_file_path is None:
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        config_dir = os.path.join(os.path.dirname(current_dir), "config")
-        rules_file_path = os.path.join(config_dir, "cloaked_file_rules.json")
+        rules_file_path = DEFAULT_CLOAKED_RULES_FILE
 
     # Initialize the detector
     detector = CloakedFileDetector(rules_file_path)
@@ -394,9 +534,7 @@ def uncloak_file_extensions(
     """
     # Use default rules file if not provided
     if rules_file_path is None:
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        config_dir = os.path.join(os.path.dirname(current_dir), "config")
-        rules_file_path = os.path.join(config_dir, "cloaked_file_rules.json")
+        rules_file_path = DEFAULT_CLOAKED_RULES_FILE
 
     # Initialize the detector
     detector = CloakedFileDetector(rules_file_path)
@@ -442,7 +580,7 @@ def add_file_to_groups(file: str, groups: list[ArchiveGroup]) -> ArchiveGroup |
                 new_path = os.path.join(
                     os.path.dirname(main_archive_path), file_basename
                 )
-                shutil.move(file, new_path)
+                _move(file, new_path)
                 group.add_file(new_path)
                 return group
 
@@ -483,7 +621,7 @@ def relocate_multipart_parts_from_directory(
     for root, _dirs, files in os.walk(source_root):
         for filename in files:
             # Only consider multipart-looking filenames
-            if not re.search(multipart_regex, filename):
+            if not _MULTIPART_RE.search(filename):
                 continue
 
             file_path = os.path.join(root, filename)
@@ -515,7 +653,7 @@ def relocate_multipart_parts_from_directory(
 
                     try:
                         os.makedirs(dest_dir, exist_ok=True)
-                        shutil.move(file_path, final_dest)
+                        _move(file_path, final_dest)
                         group.add_file(final_dest)
                         relocated += 1
                         break  # Do not match same file to another group
@@ -553,7 +691,7 @@ def ensure_contained_multipart_groups(
     created = 0
 
     def _base_for_part_notation(filename: str) -> str | None:
-        m = re.match(r"^(.*)\.part(\d+)\.rar$", filename, re.IGNORECASE)
+        m = _RAR_PART_NOTATION_RE.match(filename)
         if not m:
             return None
         return m.group(1)
@@ -572,12 +710,15 @@ def ensure_contained_multipart_groups(
             base_name = base_part
         existing.add((d, base_name))
 
-    # Bucket multipart-looking files by (dir, base)
-    buckets: dict[tuple[str, str], list[str]] = {}
+    # Bucket multipart-looking files by (dir, base). The path is split once
+    # per file and each directory is made absolute once, since a set's parts
+    # all share one directory.
+    buckets: defaultdict[tuple[str, str], list[str]] = defaultdict(list)
+    abs_dirs: dict[str, str] = {}
     for p in file_paths:
         if not os.path.exists(p):
             continue
-        filename = os.path.basename(p)
+        dir_part, filename = os.path.split(p)
 
         base_part = _base_for_part_notation(filename)
         if base_part is not None:
@@ -585,8 +726,10 @@ def ensure_contained_multipart_groups(
         else:
             base_name, _ext = get_archive_base_name(filename)
 
-        key = (os.path.abspath(os.path.dirname(p)), base_name)
-        buckets.setdefault(key, []).append(p)
+        abs_dir = abs_dirs.get(dir_part)
+        if abs_dir is None:
+            abs_dir = abs_dirs[dir_part] = os.path.abspath(dir_part)
+        buckets[(abs_dir, base_name)].append(p)
 
     for (dir_path, base_name), files in buckets.items():
         # Identify an unambiguous multipart primary within this bucket
@@ -596,20 +739,20 @@ def ensure_contained_multipart_groups(
         for p in files:
             fname = os.path.basename(p).lower()
             # 7z primary
-            if re.search(r"\.7z\.(0*1)$", fname):
+            if _7Z_FIRST_PART_RE.search(fname):
                 primary = p
                 break
             # tar.* primary
-            if re.search(r"\.tar\.(gz|bz2|xz)\.(0*1)$", fname):
+            if _TAR_FIRST_PART_RE.search(fname):
                 primary = p
                 break
             # rar part notation primary
-            if re.search(r"\.part1\.rar$", fname):
+            if _RAR_FIRST_PART_RE.search(fname):
                 primary = p
                 break
             # 7-Zip generic numbered split primary (any extension): name.<ext>.001
             # The .001 suffix is unambiguous, so the .001 alone is enough.
-            if re.search(r"\.[a-z0-9]+\.0{2,}1$", fname):
+            if _GENERIC_FIRST_PART_RE.search(fname):
                 primary = p
                 break
 
@@ -631,26 +774,26 @@ def ensure_contained_multipart_groups(
                 fname = os.path.basename(p).lower()
                 if fname.endswith(".zipx"):
                     has_zipx = p
-                elif re.search(r"\.zx\d{2}$", fname):
+                elif _ZIPX_CONTINUATION_RE.search(fname):
                     has_zx_cont = True
                 elif fname.endswith(".zip"):
                     has_zip = p
-                elif re.search(r"\.z\d{2}$", fname):
+                elif _ZIP_CONTINUATION_RE.search(fname):
                     has_z_cont = True
 
                 if fname.endswith(".rar"):
                     has_rar = p
-                elif re.search(r"\.r\d{2}$", fname):
+                elif _RAR_CONTINUATION_RE.search(fname):
                     has_r_cont = True
 
                 if fname.endswith(".arj"):
                     has_arj = p
-                elif re.search(r"\.a\d{2}$", fname):
+                elif _ARJ_CONTINUATION_RE.search(fname):
                     has_a_cont = True
 
                 if fname.endswith(".ace"):
                     has_ace = p
-                elif re.search(r"\.c\d{2}$", fname):
+                elif _ACE_CONTINUATION_RE.search(fname):
                     has_c_cont = True
 
             if has_zip is not None and has_z_cont:
@@ -700,14 +843,58 @@ def ensure_contained_multipart_groups(
     return created
 
 
+def _list_dir_casefolded(directory: str) -> set[str] | None:
+    """Casefolded names in a directory, or None if it cannot be listed."""
+    try:
+        return {name.casefold() for name in os.listdir(directory)}
+    except OSError:
+        return None
+
+
+def _destination_taken(path: str, taken: set[str] | None) -> bool:
+    """
+    Check whether a destination path is in use, using its directory listing.
+    利用目录列表检查目标路径是否已被占用。
+
+    A name missing from the casefolded listing is free; a hit (possibly only
+    a case-insensitive one) or an unlisted directory is confirmed with a stat.
+    """
+    if taken is not None and os.path.basename(path).casefold() not in taken:
+        return False
+    return os.path.exists(path)
+
+
+def _move_file(source: str, destination: str, destination_dev: int | None) -> None:
+    """
+    Move a file, renaming it directly when it stays on the same device.
+    移动文件；若仍在同一设备上则直接重命名。
+
+    shutil.move probes the destination and the source again before it tries
+    a rename; on the same device a plain os.rename is all that is needed.
+    Cross-device moves, and renames the OS refuses, go through shutil.move.
+    """
+    if destination_dev is not None:
+        try:
+            same_device = os.stat(source).st_dev == destination_dev
+        except OSError:
+            same_device = False
+        if same_device:
+            try:
+                _rename(source, destination)
+                return
+            except OSError:
+                pass
+    _move(source, destination)
+
+
 def move_files_preserving_structure(
     file_paths: list[str],
     source_root: str,
     destination_root: str,
     verbose: bool = False,
-    progress_callback: callable = None,
-    success_callback: callable = None,
-    error_callback: callable = None,
+    progress_callback: Callable[[], object] | None = None,
+    success_callback: Callable[[str], object] | None = None,
+    error_callback: Callable[[str], object] | None = None,
 ) -> list[str]:
     """
     Move files from source to destination while preserving directory structure.
@@ -726,6 +913,11 @@ def move_files_preserving_structure(
         List of relative paths that were successfully moved 成功移动的相对路径列表
     """
     moved_files = []
+    # Destination directory -> casefolded names already in it (None if it could
+    # not be listed); a directory is listed once, right after it is created
+    taken_names: dict[str, set[str] | None] = {}
+    # Destination directory -> st_dev, to rename instead of copy when possible
+    destination_devs: dict[str, int | None] = {}
 
     for file_path in file_paths:
         if os.path.exists(file_path):
@@ -737,17 +929,28 @@ def move_files_preserving_structure(
 
                 # Create destination directory if it doesn't exist
                 destination_dir = os.path.dirname(destination)
-                os.makedirs(destination_dir, exist_ok=True)
+                if destination_dir not in taken_names:
+                    os.makedirs(destination_dir, exist_ok=True)
+                    taken_names[destination_dir] = _list_dir_casefolded(destination_dir)
+                    try:
+                        destination_devs[destination_dir] = os.stat(
+                            destination_dir
+                        ).st_dev
+                    except OSError:
+                        destination_devs[destination_dir] = None
+                taken = taken_names[destination_dir]
 
                 # Handle duplicate filenames while preserving directory structure
                 counter = 1
                 original_destination = destination
-                while os.path.exists(destination):
+                while _destination_taken(destination, taken):
                     name, ext = os.path.splitext(original_destination)
                     destination = f"{name}_{counter}{ext}"
                     counter += 1
 
-                shutil.move(file_path, destination)
+                if taken is not None:
+                    taken.add(os.path.basename(destination).casefold())
+                _move_file(file_path, destination, destination_devs[destination_dir])
                 moved_files.append(relative_path)
 
                 # Call progress callback if provided
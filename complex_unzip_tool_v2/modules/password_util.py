@@ -1,19 +1,37 @@
 import os
-from complex_unzip_tool_v2.classes.PasswordBook import PasswordBook
+from concurrent.futures import ThreadPoolExecutor
 
+from complex_unzip_tool_v2.classes.PasswordBook import PasswordBook, read_password_file
 
-def load_all_passwords(paths: list[str]) -> PasswordBook:
-    """Load all passwords from a directory 从目录加载所有密码"""
+
+def load_all_passwords(paths: list[str], max_workers: int = 8) -> PasswordBook:
+    """Load all passwords from a directory 从目录加载所有密码
+
+    The folders' password files are read concurrently (1 disables the pool);
+    merging into the book stays serial and in input order.
+    各文件夹的密码文件并行读取；合并仍按输入顺序串行进行。
+    """
     password_book = PasswordBook()
 
-    # load password from paths
+    # load password from paths; inputs from one folder share its file
+    password_files: dict[str, None] = {}
     for path in paths:
         if os.path.isdir(path):
             # load from directory
-            password_book.load_passwords(os.path.join(path, "passwords.txt"))
+            password_files[os.path.join(path, "passwords.txt")] = None
         else:
             parent_dir = os.path.dirname(path)
-            password_book.load_passwords(os.path.join(parent_dir, "passwords.txt"))
+            password_files[os.path.join(parent_dir, "passwords.txt")] = None
+
+    if max_workers > 1 and len(password_files) > 1:
+        # Warm the parse cache; the loads below then only stat each file
+        with ThreadPoolExecutor(
+            max_workers=min(max_workers, len(password_files))
+        ) as pool:
+            list(pool.map(read_password_file, password_files))
+
+    for password_file in password_files:
+        password_book.load_passwords(password_file)
 
     return password_book
 
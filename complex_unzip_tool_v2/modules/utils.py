@@ -1,13 +1,26 @@
+import functools
 import re
 import os
 import unicodedata
 from difflib import SequenceMatcher
 
+# < > : " | ? * and control characters (0-31)
+_INVALID_FILENAME_CHARS_RE = re.compile(r'[<>:"|?*\x00-\x1f]')
+_RESERVED_WINDOWS_NAMES = frozenset(
+    {"CON", "PRN", "AUX", "NUL"}
+    | {f"COM{i}" for i in range(1, 10)}
+    | {f"LPT{i}" for i in range(1, 10)}
+)
 
+
+@functools.lru_cache(maxsize=4096)
 def sanitize_filename(filename: str, max_length: int = 100) -> str:
     """
     Sanitize a filename to be safe for Windows file systems.
 
+    Results are memoized: sanitize_path re-sanitizes every parent folder name
+    for each directory it is given, and a tree repeats the same names a lot.
+
     Args:
         filename (str): The original filename
         max_length (int): Maximum length for the filename (default: 100)
@@ -22,9 +35,7 @@ def sanitize_filename(filename: str, max_length: int = 100) -> str:
     filename = unicodedata.normalize("NFKD", filename)
 
     # Remove or replace invalid Windows filename characters
-    # < > : " | ? * and control characters (0-31)
-    invalid_chars = r'[<>:"|?*\x00-\x1f]'
-    filename = re.sub(invalid_chars, "_", filename)
+    filename = _INVALID_FILENAME_CHARS_RE.sub("_", filename)
 
     # Replace additional problematic characters
     filename = filename.replace("/", "_").replace("\\", "_")
@@ -33,33 +44,8 @@ def sanitize_filename(filename: str, max_length: int = 100) -> str:
     filename = filename.strip(" .")
 
     # Handle reserved Windows names
-    reserved_names = {
-        "CON",
-        "PRN",
-        "AUX",
-        "NUL",
-        "COM1",
-        "COM2",
-        "COM3",
-        "COM4",
-        "COM5",
-        "COM6",
-        "COM7",
-        "COM8",
-        "COM9",
-        "LPT1",
-        "LPT2",
-        "LPT3",
-        "LPT4",
-        "LPT5",
-        "LPT6",
-        "LPT7",
-        "LPT8",
-        "LPT9",
-    }
-
     name_without_ext = os.path.splitext(filename)[0].upper()
-    if name_without_ext in reserved_names:
+    if name_without_ext in _RESERVED_WINDOWS_NAMES:
         filename = f"_{filename}"
 
     # Truncate if too long, keeping extension if present
@@ -138,13 +124,20 @@ def sanitize_path(path: str, max_path_length: int = 200) -> str:
     return sanitized_path
 
 
-def get_string_similarity(str1, str2):
+def get_string_similarity(str1: str, str2: str, min_ratio: float = 0.0) -> float:
     """
     Calculate similarity between two strings using SequenceMatcher.
 
+    Callers that only compare the result against a threshold can pass it as
+    ``min_ratio``: SequenceMatcher's cheap upper bounds (real_quick_ratio,
+    quick_ratio) are checked first, and the full ratio is only computed when
+    they reach it.
+
     Args:
         str1 (str): First string to compare
         str2 (str): Second string to compare
+        min_ratio (float): Threshold the caller compares against; a result
+            below it may be an upper bound instead of the exact ratio
 
     Returns:
         float: Similarity ratio between 0.0 (no similarity) and 1.0 (identical)
@@ -154,4 +147,10 @@ def get_string_similarity(str1, str2):
     if not str1 or not str2:
         return 0.0
 
-    return SequenceMatcher(None, str1.lower(), str2.lower()).ratio()
+    matcher = SequenceMatcher(None, str1.lower(), str2.lower())
+    if min_ratio > 0.0:
+        for upper_bound in (matcher.real_quick_ratio, matcher.quick_ratio):
+            bound = upper_bound()
+            if bound < min_ratio:
+                return bound
+    return matcher.ratio()
@@ -0,0 +1,21 @@
+import pytest
+
+from complex_unzip_tool_v2.modules import archive_utils
+
+
+@pytest.fixture
+def isolated_cwd(tmp_path_factory, monkeypatch):
+    """Run the test from its own empty working directory.
+
+    extract_files loads and may save passwords.txt in the current directory,
+    so tests driving it must not share (or touch) the checkout's copy.
+    """
+    cwd = tmp_path_factory.mktemp("cwd")
+    monkeypatch.chdir(cwd)
+    return cwd
+
+
+@pytest.fixture
+def seven_zip_present(monkeypatch):
+    """Report 7z as available, so extract_files runs without the bundled binary."""
+    monkeypatch.setattr(archive_utils, "seven_zip_available", lambda *a, **k: True)
@@ -1,14 +1,18 @@
 import builtins
 import os
+import threading
 import types
 import importlib
 
+import pytest
+
 import complex_unzip_tool_v2.modules.archive_utils as au
 from complex_unzip_tool_v2.classes.ArchiveTypes import (
     ArchivePasswordError,
     ArchiveCorruptedError,
     ArchiveUnsupportedError,
     ArchiveFileInfo,
+    SevenZipNotFoundError,
 )
 
 
@@ -133,8 +137,8 @@ def test_extract_nested_archives_treats_non_archive_as_regular_file(
 
     assert result.get("success") is True
     assert result.get("errors") == []
-    finals = result.get("final_files")
-    assert any(p.endswith("video.mp4") for p in finals)
+    finals = {os.path.basename(p) for p in result.get("final_files")}
+    assert "video.mp4" in finals
 
 
 def test_is_valid_archive_true_on_password_protected(monkeypatch):
@@ -146,6 +150,83 @@ def test_is_valid_archive_true_on_password_protected(monkeypatch):
     assert au.is_valid_archive("protected.7z") is True
 
 
+def test_resolve_seven_zip_path_stats_a_found_executable_once(monkeypatch, tmp_path):
+    seven_zip = tmp_path / "7z.exe"
+    seven_zip.write_bytes(b"")
+    au._find_seven_zip.cache_clear()
+    stats = []
+    real_isfile = os.path.isfile
+    monkeypatch.setattr(
+        au.os.path, "isfile", lambda p: stats.append(p) or real_isfile(p)
+    )
+
+    assert au._resolve_seven_zip_path(str(seven_zip)) == str(seven_zip)
+    assert au._resolve_seven_zip_path(str(seven_zip)) == str(seven_zip)
+    assert stats == [str(seven_zip)]
+
+
+def test_resolve_seven_zip_path_missing_raises_every_time(tmp_path):
+    au._find_seven_zip.cache_clear()
+    missing = str(tmp_path / "7z.exe")
+    for _ in range(2):
+        with pytest.raises(SevenZipNotFoundError):
+            au._resolve_seven_zip_path(missing)
+
+
+def test_resolve_seven_zip_path_rejects_directory(tmp_path):
+    au._find_seven_zip.cache_clear()
+    (tmp_path / "7z.exe").mkdir()
+    with pytest.raises(SevenZipNotFoundError):
+        au._resolve_seven_zip_path(str(tmp_path / "7z.exe"))
+
+
+def test_seven_zip_available(tmp_path):
+    au._find_seven_zip.cache_clear()
+    seven_zip = tmp_path / "7z.exe"
+    assert au.seven_zip_available(str(seven_zip)) is False
+    seven_zip.write_bytes(b"")
+    assert au.seven_zip_available(str(seven_zip)) is True
+
+
+def test_probe_archives_overlaps_checks_and_keeps_order(monkeypatch):
+    paths = ["a.zip", "b.txt", "c.7z", "d.bin"]
+    # Every check waits for all the others, so this only passes when they overlap
+    barrier = threading.Barrier(len(paths), timeout=5)
+
+    def fake_is_valid(path, password="", seven_zip_path=None):
+        barrier.wait()
+        return path.endswith((".zip", ".7z"))
+
+    monkeypatch.setattr(au, "is_valid_archive", fake_is_valid)
+
+    result = au._probe_archives(paths, max_workers=len(paths))
+
+    assert result == [True, False, True, False]
+
+
+@pytest.mark.parametrize(
+    "returncode, output_on_success, decoded",
+    [(0, True, True), (0, False, False), (2, False, True)],
+)
+def test_run_7z_cmd_decodes_only_needed_output(
+    monkeypatch, returncode, output_on_success, decoded
+):
+    completed = types.SimpleNamespace(
+        returncode=returncode, stdout=b"Everything is Ok", stderr=b""
+    )
+    monkeypatch.setattr(au.subprocess, "run", lambda *a, **k: completed)
+
+    stdout, _, code = au._run_7z_cmd(["7z.exe"], output_on_success=output_on_success)
+
+    assert code == returncode
+    assert stdout == ("Everything is Ok" if decoded else "")
+
+
+def test_build_7z_list_cmd():
+    cmd = au._build_7z_list_cmd("7z.exe", "secret", "archive.zip")
+    assert cmd == ["7z.exe", "l", "-slt", "-bsp0", "-psecret", "archive.zip"]
+
+
 def test_build_7z_extract_cmd():
     cmd = au._build_7z_extract_cmd(
         seven_zip_path="7z.exe",
@@ -161,6 +242,7 @@ def test_build_7z_extract_cmd():
         "x",
         "-psecret",
         "-o/out",
+        "-bsp0",
         "-y",
         "archive.zip",
         "file1.txt",
@@ -178,7 +260,7 @@ def test_build_7z_extract_cmd_no_overwrite():
         overwrite=False,
     )
 
-    expected = ["7z.exe", "x", "-p", "-o/out", "-aos", "archive.zip"]
+    expected = ["7z.exe", "x", "-p", "-o/out", "-bsp0", "-aos", "archive.zip"]
     assert cmd == expected
 
 
@@ -297,12 +379,44 @@ def test_nested_continuation_parts_are_relocated(monkeypatch, tmp_path):
     # The continuation part should not appear in final files
     finals = result.get("final_files")
     assert finals is not None
-    assert not any(p.endswith("MySet.7z.002") for p in finals)
+    assert "MySet.7z.002" not in {os.path.basename(p) for p in finals}
     # Relocator should have been invoked with the nested file path
     assert len(called_with) == 1
     assert os.path.basename(called_with[0]) == "MySet.7z.002"
 
 
+@pytest.mark.parametrize("verbose, expected_lines", [(False, 1), (True, 3)])
+def test_skipped_continuation_parts_reported_per_level_unless_verbose(
+    monkeypatch, tmp_path, verbose, expected_lines
+):
+    (tmp_path / "outer.7z").write_bytes(b"dummy")
+    monkeypatch.setattr(
+        au, "is_valid_archive", lambda p, *a, **k: os.path.basename(p) == "outer.7z"
+    )
+
+    def fake_extract(archive_path: str, output_path: str, *args, **kwargs) -> bool:
+        _ = (archive_path, args, kwargs)
+        os.makedirs(output_path, exist_ok=True)
+        for index in range(2, 5):
+            with open(os.path.join(output_path, f"Set.7z.00{index}"), "wb") as f:
+                f.write(b"part-bytes")
+        return True
+
+    monkeypatch.setattr(au, "extractArchiveWith7z", fake_extract)
+    messages: list[str] = []
+    monkeypatch.setattr(au, "print_info", lambda msg, *a, **k: messages.append(msg))
+
+    au.extract_nested_archives(
+        archive_path=str(tmp_path / "outer.7z"),
+        output_path=str(tmp_path / "out"),
+        interactive=False,
+        use_recycle_bin=False,
+        verbose=verbose,
+    )
+
+    assert len([m for m in messages if "continuation file" in m]) == expected_lines
+
+
 def test_nested_continuation_parts_skipped_when_not_relocated(monkeypatch, tmp_path):
     """If relocation says False, continuation parts are still skipped (not treated as finals)."""
     archive_path = str(tmp_path / "outer.7z")
@@ -337,9 +451,9 @@ def test_nested_continuation_parts_skipped_when_not_relocated(monkeypatch, tmp_p
     )
 
     assert result.get("success") is True
-    finals = result.get("final_files")
+    finals = {os.path.basename(p) for p in result.get("final_files")}
     # Continuation should still be skipped from finals even if not relocated
-    assert not any(p.endswith("AnotherSet.7z.003") for p in finals)
+    assert "AnotherSet.7z.003" not in finals
     assert len(called_with) == 1
     assert os.path.basename(called_with[0]) == "AnotherSet.7z.003"
 
@@ -394,10 +508,8 @@ def test_nested_continuation_parts_relocated_across_all_formats(monkeypatch, tmp
             group_relocator=relocator,
         )
 
-        finals = result.get("final_files") or []
-        assert not any(
-            os.path.basename(p) == cont_name for p in finals
-        ), f"{cont_name} should not be a final file"
+        finals = {os.path.basename(p) for p in result.get("final_files") or []}
+        assert cont_name not in finals, f"{cont_name} should not be a final file"
         assert [os.path.basename(p) for p in called_with] == [
             cont_name
         ], f"{cont_name} should be relocated as a continuation"
@@ -449,5 +561,4 @@ def test_nested_multipart_missing_parts_are_preserved_in_final_files(
 
     finals = result.get("final_files")
     assert isinstance(finals, list)
-    assert any(p.endswith("MySet.7z.001") for p in finals)
-    assert any(p.endswith("MySet.7z.002") for p in finals)
+    assert {"MySet.7z.001", "MySet.7z.002"} <= {os.path.basename(p) for p in finals}
@@ -3,15 +3,27 @@
 import json
 import os
 import re
-import tempfile
 import pytest
 from unittest.mock import patch, mock_open
 
 from complex_unzip_tool_v2.modules.cloaked_file_detector import (
     CloakedFileDetector,
     CloakedFileRule,
+    MULTIPART_RE,
+    PROPER_FORMAT_PATTERNS,
+    PROPER_SINGLE_EXTS,
+    RuleBucket,
+    _is_already_proper_format_cached,
+    already_proper_names,
+    ext_pattern_leads,
+    split_extension,
+    split_filename,
 )
 
+# 7z signature followed by zeroed start-header fields: enough for signature
+# detection to report 7z. Built once and shared by the tests writing it.
+SEVEN_ZIP_STUB = b"7z\xbc\xaf\x27\x1c" + b"\x00" * 32
+
 
 class TestCloakedFileRule:
     """Tests for CloakedFileRule dataclass."""
@@ -76,6 +88,75 @@ class TestCloakedFileRule:
                 enabled=True,
             )
 
+    def test_invalid_regex_raises_value_error(self):
+        """An uncompilable pattern is rejected when the rule is created."""
+        with pytest.raises(ValueError, match="Invalid regex"):
+            CloakedFileRule(
+                name="test_rule",
+                filename_pattern=r"^(.+[invalid",
+                ext_pattern=r"^(\d{3})$",
+                priority=100,
+                matching_type="both",
+                type="7z",
+                enabled=True,
+            )
+
+    def test_patterns_compiled_at_creation(self):
+        """Patterns are compiled once and recompiled if reassigned."""
+        rule = CloakedFileRule(
+            name="test_rule",
+            filename_pattern=r"^(.+)\.7z.+$",
+            ext_pattern=r"^(\d{3})$",
+            priority=100,
+            matching_type="both",
+            type="7z",
+            enabled=True,
+        )
+        compiled = rule.filename_re
+        assert compiled.pattern == r"^(.+)\.7z.+$"
+        assert rule.filename_re is compiled
+        assert rule.ext_re.pattern == r"^(\d{3})$"
+
+        rule.filename_pattern = r"^(.+)\.rar.+$"
+        assert rule.filename_re.pattern == r"^(.+)\.rar.+$"
+
+    def test_rule_uses_slots(self):
+        """Rules carry no per-instance __dict__."""
+        rule = CloakedFileRule(
+            name="test_rule",
+            filename_pattern=r"^(.+)\.7z.+$",
+            ext_pattern=r"^(\d{3})$",
+            priority=100,
+            matching_type="both",
+            type="7z",
+            enabled=True,
+        )
+        assert not hasattr(rule, "__dict__")
+        with pytest.raises(AttributeError):
+            rule.unknown_attribute = True
+
+    @pytest.mark.parametrize(
+        "matching_type,ext_pattern,expected",
+        [
+            ("both", r"^(\d{3})$", "_match_both"),
+            ("both", "", "_match_both_extensionless"),
+            ("filename", "", "_match_filename"),
+            ("ext", r"^(z\d{2})$", "_match_ext"),
+        ],
+    )
+    def test_matcher_selected_at_creation(self, matching_type, ext_pattern, expected):
+        """Each rule binds the matcher for its shape once, at creation."""
+        rule = CloakedFileRule(
+            name="test_rule",
+            filename_pattern=r"^(.+)$",
+            ext_pattern=ext_pattern,
+            priority=100,
+            matching_type=matching_type,
+            type="7z",
+            enabled=True,
+        )
+        assert rule._match_fn == getattr(rule, expected)
+
     def test_ext_type_missing_pattern(self):
         """Test that 'ext' matching_type requires ext_pattern."""
         with pytest.raises(ValueError, match="ext_pattern required"):
@@ -95,7 +176,7 @@ class TestCloakedFileDetector:
 
     # pylint: disable=protected-access
     @pytest.fixture
-    def temp_rules_file(self):
+    def temp_rules_file(self, tmp_path_factory):
         """Create a temporary rules file for testing."""
         rules_data = {
             "rules": [
@@ -155,11 +236,10 @@ class TestCloakedFileDetector:
                 },
             ]
         }
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
-            json.dump(rules_data, f, indent=2)
-            temp_file = f.name
-        yield temp_file
-        os.unlink(temp_file)
+        # Kept out of tmp_path, which tests use for the files they inspect
+        rules_file = tmp_path_factory.mktemp("rules") / "rules.json"
+        rules_file.write_text(json.dumps(rules_data, indent=2), encoding="utf-8")
+        return str(rules_file)
 
     @pytest.fixture
     def detector_with_real_config(self):
@@ -235,6 +315,16 @@ class TestCloakedFileDetector:
         assert result is not None
         assert result.endswith("missedyou.7z.002")
 
+    @pytest.mark.parametrize(
+        "filename",
+        ["archive.7z", "ARCHIVE.ZIP", "a.tar.gz", "a.7z.001", "a.part1.rar", "a.z01"],
+    )
+    def test_proper_names_skip_rule_matching(self, detector, filename):
+        """Already-proper names return before any rule is evaluated."""
+        with patch.object(detector, "_candidate_bucket") as mock_bucket:
+            assert detector.detect_cloaked_file(f"/tmp/{filename}") is None
+        mock_bucket.assert_not_called()
+
     def test_init_with_valid_rules_file(self, temp_rules_file):
         """Test initialization with valid rules file."""
         detector = CloakedFileDetector(temp_rules_file)
@@ -257,12 +347,71 @@ class TestCloakedFileDetector:
         ) as mock_print_error, patch(
             "builtins.open", mock_open(read_data='{"invalid": "json"}')
         ), patch(
-            "json.load", side_effect=json.JSONDecodeError("msg", "doc", 0)
+            "json.loads", side_effect=json.JSONDecodeError("msg", "doc", 0)
         ):
             detector = CloakedFileDetector("test.json")
             assert len(detector.rules) == 0
             mock_print_error.assert_called_once()
 
+    def test_load_rules_cached_until_file_changes(self, temp_rules_file):
+        """A second load of an unchanged file skips parsing; edits reparse."""
+        CloakedFileDetector.clear_rules_cache()
+        first = CloakedFileDetector(temp_rules_file)
+        with patch("json.loads") as mock_loads:
+            second = CloakedFileDetector(temp_rules_file)
+        mock_loads.assert_not_called()
+        assert [r.name for r in second.rules] == [r.name for r in first.rules]
+        assert second.rules[0] is not first.rules[0]
+        assert second.rules[0].filename_re is first.rules[0].filename_re
+
+        # Rules are copies: changing one detector's rule leaves others alone
+        second.rules[0].filename_pattern = r"^never$"
+        assert second._match_rule("archive.7z删除.001", second.rules[0]) is None
+        assert first._match_rule("archive.7z删除.001", first.rules[0]) is not None
+
+        with open(temp_rules_file, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        data["rules"] = data["rules"][:1]
+        with open(temp_rules_file, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=4)
+        assert len(CloakedFileDetector(temp_rules_file).rules) == 1
+
+        CloakedFileDetector.clear_rules_cache()
+        with patch("json.loads", wraps=json.loads) as mock_loads:
+            CloakedFileDetector(temp_rules_file)
+        mock_loads.assert_called_once()
+
+    def test_get_rule_by_name(self, detector):
+        """Rules can be looked up by name; unknown names return None."""
+        rule = detector.get_rule("ext_only_rule")
+        assert rule is not None
+        assert rule.ext_pattern == r"^(z\d{2})$"
+        assert detector.get_rule("no_such_rule") is None
+
+    def test_load_rules_duplicate_names(self, tmp_path):
+        """A duplicate rule name is skipped with a warning; other rules load."""
+        rule = {
+            "name": "same_name",
+            "filename_pattern": r"^(.+)\.7z.+$",
+            "ext_pattern": r"^(\d{3})$",
+            "priority": 100,
+            "matching_type": "both",
+            "type": "7z",
+        }
+        duplicate = {**rule, "priority": 90, "type": "rar"}
+        other = {**rule, "name": "other", "priority": 80}
+        rules_file = tmp_path / "rules.json"
+        rules_file.write_text(
+            json.dumps({"rules": [rule, duplicate, other]}), encoding="utf-8"
+        )
+        with patch(
+            "complex_unzip_tool_v2.modules.cloaked_file_detector.print_warning"
+        ) as mock_warning:
+            detector = CloakedFileDetector(str(rules_file))
+        assert [r.name for r in detector.rules] == ["same_name", "other"]
+        assert detector.get_rule("same_name").type == "7z"
+        mock_warning.assert_called_once()
+
     def test_rules_sorted_by_priority(self, detector):
         """Test that rules are sorted by priority (descending)."""
         priorities = [rule.priority for rule in detector.rules]
@@ -294,11 +443,7 @@ class TestCloakedFileDetector:
 
     def test_match_rule_filename_type(self, detector):
         """Test matching with 'filename' type."""
-        rule = None
-        for r in detector.rules:
-            if r.name == "filename_only_rule":
-                rule = r
-                break
+        rule = detector.get_rule("filename_only_rule")
         assert rule is not None
         # Pattern is ^([^.]+)\.([a-z]+)\.(\d+)$ which captures base, type, and number
         # This pattern expects lowercase letters only, so use "rar" instead of "7z"
@@ -307,22 +452,14 @@ class TestCloakedFileDetector:
 
     def test_match_rule_ext_type(self, detector):
         """Test matching with 'ext' type."""
-        rule = None
-        for r in detector.rules:
-            if r.name == "ext_only_rule":
-                rule = r
-                break
+        rule = detector.get_rule("ext_only_rule")
         assert rule is not None
         result = detector._match_rule("archive.z01", rule)
         assert result == ("archive", "", "z01")
 
     def test_match_rule_disabled(self, detector):
         """Test that disabled rules don't match."""
-        rule = None
-        for r in detector.rules:
-            if r.name == "disabled_rule":
-                rule = r
-                break
+        rule = detector.get_rule("disabled_rule")
         assert rule is not None
         result = detector._match_rule("file.disabled.123", rule)
         assert result is None
@@ -340,6 +477,23 @@ class TestCloakedFileDetector:
         assert not detector._is_already_proper_format("archive.7z", "7z")
         assert not detector._is_already_proper_format("test.txt", "zip")
 
+    def test_is_already_proper_format_cached(self, detector):
+        """Repeated checks are served from the cache until it is cleared."""
+        detector.clear_cache()
+        assert detector._is_already_proper_format("archive.7z.001", "7z")
+        assert detector._is_already_proper_format("archive.7z.001", "7z")
+        info = _is_already_proper_format_cached.cache_info()
+        assert (info.hits, info.misses) == (1, 1)
+        detector.clear_cache()
+        assert _is_already_proper_format_cached.cache_info().currsize == 0
+
+    def test_is_already_proper_format_custom_type(self, detector):
+        """Types outside the precompiled set are compiled on first use."""
+        detector.clear_cache()
+        assert detector._is_already_proper_format("Archive.TAR.XZ.003", "tar.xz")
+        assert not detector._is_already_proper_format("archive.tarxxz.003", "tar.xz")
+        assert "tar.xz" in PROPER_FORMAT_PATTERNS
+
     def test_generate_new_filename_with_part_number(self, detector):
         """Test generating filename with part number."""
         rule = detector.rules[0]
@@ -367,7 +521,7 @@ class TestCloakedFileDetector:
     @patch(
         "complex_unzip_tool_v2.modules.cloaked_file_detector.detect_archive_extension"
     )
-    def test_generate_new_filename_auto_type(self, mock_detect, detector):
+    def test_generate_new_filename_auto_type(self, mock_detect, detector, tmp_path):
         """Test generating filename with auto type detection."""
         mock_detect.return_value = "rar"
         # Find a rule with type "auto"
@@ -377,21 +531,20 @@ class TestCloakedFileDetector:
                 rule = r
                 break
         assert rule is not None
-        with tempfile.NamedTemporaryFile(delete=False) as temp_file:
-            temp_path = temp_file.name
-        try:
-            result = detector._generate_new_filename(
-                "archive", "auto", "1", rule, temp_path
-            )
-            assert result == "archive.rar.001"
-            mock_detect.assert_called_once_with(temp_path)
-        finally:
-            os.unlink(temp_path)
+        temp_path = str(tmp_path / "archive.bin")
+        open(temp_path, "wb").close()
+        result = detector._generate_new_filename(
+            "archive", "auto", "1", rule, temp_path
+        )
+        assert result == "archive.rar.001"
+        mock_detect.assert_called_once_with(temp_path)
 
     @patch(
         "complex_unzip_tool_v2.modules.cloaked_file_detector.detect_archive_extension"
     )
-    def test_generate_new_filename_auto_type_fallback(self, mock_detect, detector):
+    def test_generate_new_filename_auto_type_fallback(
+        self, mock_detect, detector, tmp_path
+    ):
         """Test auto type detection fallback to 7z."""
         mock_detect.return_value = None
         # Find a rule with type "auto"
@@ -401,15 +554,12 @@ class TestCloakedFileDetector:
                 rule = r
                 break
         assert rule is not None
-        with tempfile.NamedTemporaryFile(delete=False) as temp_file:
-            temp_path = temp_file.name
-        try:
-            result = detector._generate_new_filename(
-                "archive", "auto", "1", rule, temp_path
-            )
-            assert result == "archive.7z.001"
-        finally:
-            os.unlink(temp_path)
+        temp_path = str(tmp_path / "archive.bin")
+        open(temp_path, "wb").close()
+        result = detector._generate_new_filename(
+            "archive", "auto", "1", rule, temp_path
+        )
+        assert result == "archive.7z.001"
 
     @patch(
         "complex_unzip_tool_v2.modules.cloaked_file_detector.detect_archive_extension"
@@ -468,6 +618,30 @@ class TestCloakedFileDetector:
             # If no match found, that's also acceptable for this test filename
             assert result is None
 
+    @patch.object(CloakedFileDetector, "_verify_with_signature")
+    def test_detect_cloaked_file_stops_at_first_match(self, mock_verify, detector):
+        """Lower-priority rules are not evaluated once a higher one succeeds."""
+        mock_verify.return_value = True
+        bucket = detector._candidate_bucket("001")
+        with patch.object(
+            bucket, "first_match", wraps=bucket.first_match
+        ) as mock_match:
+            result = detector.detect_cloaked_file("/test/archive.7z删除.001")
+        assert result == "/test/archive.7z.001"
+        mock_match.assert_called_once()
+        index, _ = bucket.first_match(*mock_match.call_args.args)
+        assert bucket.rules[index].name == "cloaked_7z_multipart"
+
+    @patch.object(CloakedFileDetector, "_verify_with_signature")
+    def test_detect_cloaked_file_rejected_part_not_reverified(
+        self, mock_verify, detector
+    ):
+        """A part number rejected by the signature gate is verified only once."""
+        mock_verify.return_value = False
+        detector.detect_cloaked_file("/test/archive.7z删除.001")
+        # Both cloaked_7z_multipart and cloaked_extensionless yield part "001"
+        assert mock_verify.call_count == 1
+
     @patch("os.path.exists")
     @patch.object(CloakedFileDetector, "_verify_with_signature")
     def test_detect_cloaked_file_already_proper(
@@ -572,6 +746,241 @@ class TestCloakedFileDetector:
             ]
             assert mock_uncloak.call_count == 3
 
+    @pytest.mark.parametrize("max_workers", [1, 4])
+    def test_uncloak_files_checks_existence_once(self, detector, tmp_path, max_workers):
+        """Each file is checked for existence once, not again per stage."""
+        cloaked = tmp_path / "archive.7z删除.001"
+        plain = tmp_path / "notes.txt"
+        for f in (cloaked, plain):
+            f.write_bytes(b"data")
+        paths = [str(cloaked), str(plain), str(tmp_path / "missing.txt")]
+
+        with patch(
+            "complex_unzip_tool_v2.modules.cloaked_file_detector.os.path.exists",
+            wraps=os.path.exists,
+        ) as mock_exists:
+            result = detector.uncloak_files(paths, max_workers=max_workers)
+
+        assert result == [str(tmp_path / "archive.7z.001"), paths[1], paths[2]]
+        checked = [call.args[0] for call in mock_exists.call_args_list]
+        for path in paths:
+            assert checked.count(path) == 1
+        # The rename target is looked up in the directory listing instead
+        assert checked.count(result[0]) == 0
+
+    def test_uncloak_files_skips_proper_names(self, detector, tmp_path):
+        """Already proper names are neither stat'ed nor run through detection."""
+        paths = [str(tmp_path / name) for name in ("a.7z.001", "b.part2.rar", "c.zip")]
+        with patch.object(
+            detector, "_detect_existing", return_value=None
+        ) as mock_detect:
+            result = detector.uncloak_files(paths + [str(tmp_path / "d.txt")])
+        assert result[:3] == paths
+        assert [call.args[0] for call in mock_detect.call_args_list] == [
+            str(tmp_path / "d.txt")
+        ]
+
+    def test_uncloak_files_lists_each_directory_once(self, detector, tmp_path):
+        """Conflicts are found with one directory scan, confirmed by a stat."""
+        for name in ("a.7z删除.001", "b.7z删除.001", "B.7Z.001"):
+            (tmp_path / name).write_bytes(name.encode("utf-8"))
+        paths = [str(tmp_path / "a.7z删除.001"), str(tmp_path / "b.7z删除.001")]
+
+        with patch(
+            "complex_unzip_tool_v2.modules.cloaked_file_detector.os.scandir",
+            wraps=os.scandir,
+        ) as mock_scandir:
+            result = detector.uncloak_files(paths, max_workers=1)
+
+        mock_scandir.assert_called_once()
+        assert result[0] == str(tmp_path / "a.7z.001")
+        # "B.7Z.001" only matches "b.7z.001" after casefolding; the stat decides
+        # whether that is a real conflict, and nothing is ever overwritten
+        assert (tmp_path / "B.7Z.001").read_bytes() == "B.7Z.001".encode("utf-8")
+        assert len(os.listdir(tmp_path)) == 3
+
+    @pytest.mark.parametrize("max_workers", [1, 4])
+    def test_uncloak_files_same_target_in_batch(self, detector, tmp_path, max_workers):
+        """Files normalizing to one name are renamed in order, never overwritten."""
+        first = tmp_path / "a.7z删除.001"
+        second = tmp_path / "a.7z隐藏.001"
+        plain = tmp_path / "notes.txt"
+        for f in (first, second, plain):
+            f.write_bytes(f.name.encode("utf-8"))
+
+        result = detector.uncloak_files(
+            [str(first), str(second), str(plain)], max_workers=max_workers
+        )
+
+        assert result[0] == str(tmp_path / "a.7z.001")
+        assert "__duplicate_" in result[1] and result[1].endswith(".7z.001")
+        assert result[2] == str(plain)
+        assert (tmp_path / "a.7z.001").read_bytes() == first.name.encode("utf-8")
+        assert len(os.listdir(tmp_path)) == 3
+
+    @pytest.mark.parametrize(
+        "pattern,expected",
+        [
+            (r"^(\d{3})$", {r"\d"}),
+            (r"^(r\d{2})$", {"r"}),
+            (r"^(\d{2,3}|r\d{2}|z\d{2})$", {r"\d", "r", "z"}),
+            (r"^(\d{2,3}).+$", {r"\d"}),
+            (r"^(.+)$", None),
+            (r"^(z\d{2})?$", None),
+            (r"^(\d?z)$", None),
+            (r"^(a)|b", None),
+            (r"(\d{3})$", None),
+        ],
+    )
+    def test_ext_pattern_leads(self, pattern, expected):
+        """Only simple anchored patterns are keyed; others stay unkeyed."""
+        leads = ext_pattern_leads(pattern)
+        assert leads == (frozenset(expected) if expected is not None else None)
+
+    @pytest.mark.parametrize("fixture_name", ["detector", "detector_with_real_config"])
+    def test_candidate_rules_match_linear_scan(self, request, fixture_name):
+        """Indexed candidates yield exactly the matches of a full rule scan."""
+        detector = request.getfixturevalue(fixture_name)
+        filenames = [
+            "archive.7z.something.001",
+            "archive.rar.x.r01",
+            "archive.z01",
+            "archive.Z01",
+            "archive.rar.001",
+            "archive001",
+            "file.",
+            ".hidden",
+            "missedyou.7z.001删除",
+            "movie.mp4",
+            "part.٣٤٥",
+            "",
+        ]
+        for filename in filenames:
+            ext_part = split_extension(filename)[1]
+            linear = [
+                r.name
+                for r in detector.rules
+                if detector._match_rule(filename, r) is not None
+            ]
+            indexed = [
+                r.name
+                for r in detector._candidate_rules(ext_part)
+                if detector._match_rule(filename, r) is not None
+            ]
+            assert indexed == linear, filename
+
+            bucket = detector._candidate_bucket(ext_part)
+            assert bucket.gated
+            start = bucket.first_viable(filename, ext_part)
+            gated = [
+                r.name
+                for r in bucket.rules[start:]
+                if detector._match_rule(filename, r) is not None
+            ]
+            assert gated == linear, filename
+
+    @pytest.mark.parametrize("fixture_name", ["detector", "detector_with_real_config"])
+    def test_first_match_agrees_with_single_rule_matching(self, request, fixture_name):
+        """first_match returns the first rule matching on its own, from any start."""
+        detector = request.getfixturevalue(fixture_name)
+        filenames = [
+            "archive.7z删除.001",
+            "archive.rar.x.r01",
+            "archive.z01",
+            "archive001",
+            "file.",
+            ".hidden",
+            "movie.mp4",
+        ]
+        for filename in filenames:
+            name_part, ext_part = split_extension(filename)
+            bucket = detector._candidate_bucket(ext_part)
+            for start in range(len(bucket.rules) + 1):
+                expected = next(
+                    (
+                        (index, result)
+                        for index, rule in enumerate(bucket.rules)
+                        if index >= start
+                        and (result := detector._match_rule(filename, rule))
+                    ),
+                    None,
+                )
+                assert (
+                    bucket.first_match(start, filename, name_part, ext_part) == expected
+                )
+
+    def test_rule_bucket_not_gated_with_backreference(self, detector):
+        """Patterns that cannot be embedded safely disable the union gate."""
+        rule = CloakedFileRule(
+            name="backref",
+            filename_pattern=r"^(.)\1$",
+            ext_pattern="",
+            priority=1,
+            matching_type="filename",
+            type="7z",
+            enabled=True,
+        )
+        bucket = RuleBucket([*detector._candidate_rules(""), rule])
+        assert not bucket.gated
+        assert bucket.first_viable("aa", "") == 0
+
+    @pytest.mark.parametrize("fixture_name", ["detector", "detector_with_real_config"])
+    def test_batch_starts_match_one_at_a_time(self, request, fixture_name):
+        """One finditer per bucket gives the same starts as per-file gating."""
+        detector = request.getfixturevalue(fixture_name)
+        file_paths = [
+            "/d/archive.7z删除.001",
+            "/d/archive.rar.x.r01",
+            "/d/archive.z01",
+            "/d/archive.rar.001",
+            "/d/archive001",
+            "/d/file.",
+            "/d/.hidden",
+            "/d/missedyou.7z.001删除",
+            "/d/movie.mp4",
+            "/d/part.٣٤٥",
+            "/d/",
+        ]
+        expected = []
+        for file_path in file_paths:
+            filename = os.path.basename(file_path)
+            ext_part = split_extension(filename)[1]
+            bucket = detector._candidate_bucket(ext_part)
+            assert bucket.batch_safe
+            expected.append(bucket.first_viable(filename, ext_part))
+        assert detector._plan_starts(file_paths) == expected
+
+        for file_path, start in zip(file_paths, expected):
+            assert detector.detect_cloaked_file(
+                file_path, start=start
+            ) == detector.detect_cloaked_file(file_path)
+
+    @pytest.mark.parametrize(
+        "filename_pattern", [r"^[^.]+\.x$", r"^a+\Z", r"^(?!b)a+$"]
+    )
+    def test_batch_gate_falls_back_per_file(self, filename_pattern):
+        """Cross-line matches and multiline-unsafe patterns fall back per file."""
+        rule = CloakedFileRule(
+            name="custom",
+            filename_pattern=filename_pattern,
+            ext_pattern="",
+            priority=1,
+            matching_type="filename",
+            type="7z",
+            enabled=True,
+        )
+        bucket = RuleBucket([rule])
+        filenames = ["aaa", "bbb.x", "a\nb.x"]
+        ext_parts = [split_extension(filename)[1] for filename in filenames]
+        assert bucket.first_viable_batch(filenames, ext_parts) == [
+            bucket.first_viable(filename, ext_part)
+            for filename, ext_part in zip(filenames, ext_parts)
+        ]
+        assert bucket.first_viable_batch(filenames[:2], ext_parts[:2]) == [
+            bucket.first_viable(filename, ext_part)
+            for filename, ext_part in zip(filenames[:2], ext_parts[:2])
+        ]
+
     def test_get_rule_info(self, detector):
         """Test getting rule information."""
         info = detector.get_rule_info()
@@ -583,6 +992,15 @@ class TestCloakedFileDetector:
         assert info["highest_priority"] == 100
         assert info["lowest_priority"] == 50
 
+    def test_get_rule_info_returns_copy(self, detector):
+        """Mutating a returned summary does not affect later calls."""
+        info = detector.get_rule_info()
+        info["total_rules"] = 0
+        info["rules_by_type"]["7z"] = 99
+        fresh = detector.get_rule_info()
+        assert fresh["total_rules"] == 6
+        assert fresh["rules_by_type"]["7z"] != 99
+
     def test_get_rule_info_empty_rules(self):
         """Test getting rule info with no rules."""
         with patch.object(CloakedFileDetector, "load_rules"):
@@ -596,6 +1014,46 @@ class TestCloakedFileDetector:
             assert info["highest_priority"] == 0
             assert info["lowest_priority"] == 0
 
+    def test_rules_toggled_after_loading_take_effect(self, tmp_path):
+        """enabled is honored at match time, not only when rules are loaded."""
+        rule = {
+            "name": "cloaked_7z_multipart",
+            "filename_pattern": r"^(.+)\.7z.+$",
+            "ext_pattern": r"^(\d{3})$",
+            "priority": 100,
+            "matching_type": "both",
+            "type": "7z",
+            "enabled": True,
+        }
+        rules_data = {
+            "rules": [
+                rule,
+                {**rule, "name": "duplicate_7z", "priority": 90},
+                {**rule, "name": "disabled_7z", "priority": 80, "enabled": False},
+            ]
+        }
+        rules_file = tmp_path / "rules.json"
+        rules_file.write_text(json.dumps(rules_data), encoding="utf-8")
+        detector = CloakedFileDetector(str(rules_file))
+        filename = "archive.7z删除.001"
+        name_part, ext_part = split_extension(filename)
+
+        def first_rule_name():
+            bucket = detector._candidate_bucket(ext_part)
+            found = bucket.first_match(0, filename, name_part, ext_part)
+            return bucket.rules[found[0]].name if found else None
+
+        assert first_rule_name() == "cloaked_7z_multipart"
+        assert detector.get_rule_info()["enabled_rules"] == 2
+
+        detector.get_rule("cloaked_7z_multipart").enabled = False
+        assert first_rule_name() == "duplicate_7z"
+
+        detector.get_rule("duplicate_7z").enabled = False
+        detector.get_rule("disabled_7z").enabled = True
+        assert first_rule_name() == "disabled_7z"
+        assert detector.get_rule_info()["enabled_rules"] == 1
+
 
 class TestCloakedFalsePositives:
     """Regression tests: ordinary, non-archive files must never be misdetected
@@ -651,7 +1109,7 @@ class TestCloakedFalsePositives:
         """A genuine cloaked 7z first part (valid signature) is still uncloaked."""
         f = tmp_path / "secret001"
         # 7z magic bytes so signature verification confirms it is really a 7z.
-        f.write_bytes(b"7z\xbc\xaf\x27\x1c" + b"\x00" * 32)
+        f.write_bytes(SEVEN_ZIP_STUB)
 
         result = detector_with_real_config.detect_cloaked_file(str(f))
 
@@ -672,7 +1130,7 @@ class TestCloakedFalsePositives:
         f = tmp_path / "jk_20260629_192705"
         # Real 7z signature so the signature gate passes, mirroring the SFX
         # archive that triggered the bug in the field.
-        f.write_bytes(b"7z\xbc\xaf\x27\x1c" + b"\x00" * 32)
+        f.write_bytes(SEVEN_ZIP_STUB)
 
         result = detector_with_real_config.detect_cloaked_file(str(f))
 
@@ -747,7 +1205,7 @@ class TestCloakedFileDetectorEdgeCases:
 
     # pylint: disable=protected-access
     @pytest.fixture
-    def minimal_detector(self):
+    def minimal_detector(self, tmp_path):
         """Create a detector with minimal rules for edge case testing."""
         rules_data = {
             "rules": [
@@ -762,12 +1220,9 @@ class TestCloakedFileDetectorEdgeCases:
                 }
             ]
         }
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
-            json.dump(rules_data, f, indent=2)
-            temp_file = f.name
-        detector = CloakedFileDetector(temp_file)
-        os.unlink(temp_file)
-        return detector
+        rules_file = tmp_path / "rules.json"
+        rules_file.write_text(json.dumps(rules_data, indent=2), encoding="utf-8")
+        return CloakedFileDetector(str(rules_file))
 
     def test_match_rule_filename_without_extension(self, minimal_detector):
         """Test matching filename that has no extension."""
@@ -796,7 +1251,7 @@ class TestCloakedFileDetectorEdgeCases:
             # Should handle gracefully without crashing
             assert result is None or isinstance(result, str)
 
-    def test_filename_pattern_groups_handling(self):
+    def test_filename_pattern_groups_handling(self, tmp_path):
         """Test handling of regex groups in filename patterns."""
         rules_data = {
             "rules": [
@@ -811,17 +1266,13 @@ class TestCloakedFileDetectorEdgeCases:
                 }
             ]
         }
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
-            json.dump(rules_data, f, indent=2)
-            temp_file = f.name
-        try:
-            detector = CloakedFileDetector(temp_file)
-            result = detector._match_rule("archive.zip.001.extra", detector.rules[0])
-            assert result == ("archive", "zip", "001")
-        finally:
-            os.unlink(temp_file)
-
-    def test_invalid_regex_patterns(self):
+        rules_file = tmp_path / "rules.json"
+        rules_file.write_text(json.dumps(rules_data, indent=2), encoding="utf-8")
+        detector = CloakedFileDetector(str(rules_file))
+        result = detector._match_rule("archive.zip.001.extra", detector.rules[0])
+        assert result == ("archive", "zip", "001")
+
+    def test_invalid_regex_patterns(self, tmp_path):
         """Test handling of invalid regex patterns."""
         rules_data = {
             "rules": [
@@ -836,27 +1287,23 @@ class TestCloakedFileDetectorEdgeCases:
                 }
             ]
         }
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
-            json.dump(rules_data, f, indent=2)
-            temp_file = f.name
-        try:
-            detector = CloakedFileDetector(temp_file)
-            # Test with a pattern that should cause regex issues during matching
-            # Create a rule with invalid regex manually to test error handling
-            rule = detector.rules[0] if detector.rules else None
-            if rule:
-                # Modify the pattern to be invalid after loading
-                rule.filename_pattern = r"^(.+[invalid"
-                # Test should handle regex errors gracefully
-                try:
-                    result = detector._match_rule("test.file.001", rule)
-                    # Should either return None or handle gracefully
-                    assert result is None or isinstance(result, tuple)
-                except re.error:
-                    # If regex error is not caught, that's also acceptable behavior
-                    pass
-        finally:
-            os.unlink(temp_file)
+        rules_file = tmp_path / "rules.json"
+        rules_file.write_text(json.dumps(rules_data, indent=2), encoding="utf-8")
+        detector = CloakedFileDetector(str(rules_file))
+        # Test with a pattern that should cause regex issues during matching
+        # Create a rule with invalid regex manually to test error handling
+        rule = detector.rules[0] if detector.rules else None
+        if rule:
+            # Modify the pattern to be invalid after loading
+            rule.filename_pattern = r"^(.+[invalid"
+            # Test should handle regex errors gracefully
+            try:
+                result = detector._match_rule("test.file.001", rule)
+                # Should either return None or handle gracefully
+                assert result is None or isinstance(result, tuple)
+            except re.error:
+                # If regex error is not caught, that's also acceptable behavior
+                pass
 
     def test_zero_padding_part_numbers(self, minimal_detector):
         """Test proper zero padding of part numbers."""
@@ -867,6 +1314,7 @@ class TestCloakedFileDetectorEdgeCases:
             ("001", "001"),
             ("123", "123"),
             ("1234", "1234"),  # Should not pad if already longer than 3
+            ("0001", "0001"),  # Existing leading zeros are kept as-is
         ]
         for input_part, expected_part in test_cases:
             result = minimal_detector._generate_new_filename(
@@ -880,17 +1328,25 @@ class TestCloakedFileDetectorEdgeCases:
         result = minimal_detector._generate_new_filename("archive", "", "abc", rule)
         assert result == "archive.7z.abc"  # Should preserve non-numeric parts
 
-    @patch("os.path.dirname")
-    @patch("os.path.basename")
-    def test_path_handling_edge_cases(
-        self, mock_basename, mock_dirname, minimal_detector
-    ):
+    def test_path_handling_edge_cases(self, minimal_detector):
         """Test handling of edge cases in path operations."""
-        mock_basename.return_value = "test.file"
-        mock_dirname.return_value = "/some/path"
         result = minimal_detector.detect_cloaked_file("complex/path/with/../test.file")
         # Should handle path operations correctly
         assert result is None or isinstance(result, str)
+        result = minimal_detector.detect_cloaked_file("complex/path/with/../x.test.001")
+        assert result is None or result.startswith("complex/path/with/../")
+
+    @pytest.mark.parametrize(
+        "file_path",
+        ["/a/b/archive.7z", "archive.7z", "/archive.7z", "a//b/c", "dir/", "", "/"],
+    )
+    def test_split_filename_matches_os_path(self, file_path):
+        """The directory prefix plus a new name is the os.path sibling path."""
+        dir_prefix, filename = split_filename(file_path)
+        assert filename == os.path.basename(file_path)
+        assert os.path.normpath(dir_prefix + "new") == os.path.normpath(
+            os.path.join(os.path.dirname(file_path), "new")
+        )
 
     def test_unicode_filenames(self, minimal_detector):
         """Test handling of Unicode filenames."""
@@ -904,3 +1360,20 @@ class TestCloakedFileDetectorEdgeCases:
             result = minimal_detector.detect_cloaked_file(f"/test/{filename}")
             # Should handle Unicode gracefully
             assert result is None or isinstance(result, str)
+
+
+@pytest.mark.parametrize(
+    "filenames",
+    [
+        ["a.7z.001", "notes.txt", "B.PART2.RAR", "c.z01", "x.7z删除.001", ""],
+        ["set.tar.gz.002", "set.tar.gz", "readme", "photo.jpg.003"],
+        ["bad\nname.7z.001", "a.7z.001", "a.txt"],
+    ],
+)
+def test_already_proper_names_matches_single_checks(filenames):
+    """The batched check agrees with the per-name fast-path checks."""
+    expected = [
+        name.lower().endswith(PROPER_SINGLE_EXTS) or bool(MULTIPART_RE.search(name))
+        for name in filenames
+    ]
+    assert already_proper_names(filenames) == expected
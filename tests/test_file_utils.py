@@ -1,16 +1,36 @@
 """Unit tests for file_utils module."""
 
 import os
-import tempfile
 import shutil
+import tempfile
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import Mock, patch
 from pathlib import Path
 
 import complex_unzip_tool_v2.modules.file_utils as fu
 from complex_unzip_tool_v2.classes.ArchiveGroup import ArchiveGroup
 
 
+def _raising(exc):
+    """Stand-in for a file_utils filesystem seam that always fails."""
+
+    def fail(*args, **kwargs):
+        raise exc
+
+    return fail
+
+
+def _basenames(paths) -> set[str]:
+    """Filenames of the given paths, for membership assertions."""
+    return {os.path.basename(path) for path in paths}
+
+
+def _touch_many(paths) -> None:
+    """Create empty files with one open/close each (no utime, no Path objects)."""
+    for path in paths:
+        os.close(os.open(os.fspath(path), os.O_CREAT | os.O_WRONLY, 0o644))
+
+
 class TestGetArchiveBaseName:
     """Tests for get_archive_base_name function."""
 
@@ -38,6 +58,14 @@ class TestGetArchiveBaseName:
         """Test with files without extensions."""
         assert fu.get_archive_base_name("filename") == ("filename", "")
 
+    def test_results_are_memoized(self):
+        """Repeated lookups of the same path are served from the cache."""
+        fu.get_archive_base_name.cache_clear()
+        assert fu.get_archive_base_name("set.part2.rar") == ("set", "rar")
+        assert fu.get_archive_base_name("set.part2.rar") == ("set", "rar")
+        info = fu.get_archive_base_name.cache_info()
+        assert (info.hits, info.misses) == (1, 1)
+
     def test_hidden_files(self):
         """Test with hidden files."""
         assert fu.get_archive_base_name(".hidden.zip") == (".hidden", "zip")
@@ -204,19 +232,16 @@ class TestArchiveGroupMainSelection:
 
 
 class TestCreateGroupsByNameMultipart:
-    """End-to-end grouping tests for spanned ZIP / volume RAR (Bugs A+B)."""
+    """End-to-end grouping tests for spanned ZIP / volume RAR (Bugs A+B).
 
-    def setup_method(self):
-        self.test_dir = tempfile.mkdtemp()
+    Grouping only looks at paths, so no files are created on disk.
+    """
 
-    def teardown_method(self):
-        shutil.rmtree(self.test_dir, ignore_errors=True)
+    def setup_method(self):
+        self.test_dir = os.path.join(os.sep, "archives")
 
     def _create(self, name: str) -> str:
-        p = os.path.join(self.test_dir, name)
-        with open(p, "wb") as f:
-            f.write(b"x")
-        return p
+        return os.path.join(self.test_dir, name)
 
     def test_spanned_zip_files_grouped_with_zip_as_main(self):
         files = [
@@ -286,43 +311,48 @@ class TestCreateGroupsByNameMultipart:
         self._assert_single_multipart(["a.iso.002", "a.iso.001"], "a.iso.001")
 
 
+_READ_DIR_TREE = ("file1.txt", "file2.zip", os.path.join("subdir", "nested.7z"))
+
+
+@pytest.fixture(scope="module")
+def read_dir_tree(tmp_path_factory):
+    """Build the read_dir file tree once per module; tests must not modify it."""
+    base = str(tmp_path_factory.mktemp("read_dir"))
+    os.makedirs(os.path.join(base, "subdir"))
+    files = [os.path.join(base, name) for name in _READ_DIR_TREE]
+    _touch_many(files)
+    return base
+
+
 class TestReadDir:
     """Tests for read_dir function."""
 
-    def setup_method(self):
-        """Set up test directory structure."""
-        self.test_dir = tempfile.mkdtemp()
-        self.sub_dir = os.path.join(self.test_dir, "subdir")
-        os.makedirs(self.sub_dir)
+    @pytest.fixture(autouse=True)
+    def _bind_tree(self, read_dir_tree):
+        """Point the test at the shared, read-only file tree."""
+        self._use_tree(read_dir_tree)
 
-        # Create test files
-        self.test_files = [
-            os.path.join(self.test_dir, "file1.txt"),
-            os.path.join(self.test_dir, "file2.zip"),
-            os.path.join(self.sub_dir, "nested.7z"),
-        ]
-        for file_path in self.test_files:
-            with open(file_path, "w") as f:
-                f.write("test content")
+    @pytest.fixture
+    def private_tree(self, read_dir_tree, tmp_path):
+        """Copy the shared tree for tests that add files to it."""
+        self._use_tree(shutil.copytree(read_dir_tree, str(tmp_path / "tree")))
 
-    def teardown_method(self):
-        """Clean up test directory."""
-        shutil.rmtree(self.test_dir, ignore_errors=True)
+    def _use_tree(self, base):
+        self.test_dir = base
+        self.sub_dir = os.path.join(base, "subdir")
+        self.test_files = [os.path.join(base, name) for name in _READ_DIR_TREE]
 
     def test_read_directory(self):
         """Test reading files from a directory."""
         result = fu.read_dir([self.test_dir])
         assert len(result) >= 3  # Should include all test files
-        assert any("file1.txt" in path for path in result)
-        assert any("file2.zip" in path for path in result)
-        assert any("nested.7z" in path for path in result)
+        assert {"file1.txt", "file2.zip", "nested.7z"} <= _basenames(result)
 
     def test_read_individual_files(self):
         """Test reading individual file paths."""
         result = fu.read_dir(self.test_files)
         assert len(result) == 3
-        for file_path in self.test_files:
-            assert file_path in result
+        assert set(result) == set(self.test_files)
 
     def test_mixed_files_and_directories(self):
         """Test reading mix of files and directories."""
@@ -330,7 +360,7 @@ class TestReadDir:
         result = fu.read_dir(paths)
         assert self.test_files[0] in result
         # Directory contents should also be included
-        assert any("file2.zip" in path for path in result)
+        assert "file2.zip" in _basenames(result)
 
     def test_nonexistent_paths(self):
         """Test handling of nonexistent paths."""
@@ -340,27 +370,65 @@ class TestReadDir:
             "/nonexistent/path"
         ]  # Function adds non-directory paths as-is
 
+    @pytest.mark.parametrize(
+        "name", ["Thumbs.db", "thumbs.db", "Desktop.ini", ".DS_Store", "passwords.txt"]
+    )
+    def test_ignored_file_inputs_any_case(self, name):
+        """Ignored names are matched case-insensitively, as on Windows."""
+        assert fu.read_dir([os.path.join("/nonexistent", name)]) == []
+
     def test_empty_input(self):
         """Test with empty input list."""
         result = fu.read_dir([])
         assert result == []
 
+    def test_skips_output_folder_and_ignored_files(self, private_tree):
+        """Output folders and ignored files are left out at any depth."""
+        output_dir = os.path.join(self.sub_dir, fu.OUTPUT_FOLDER)
+        os.makedirs(output_dir)
+        _touch_many(
+            [
+                os.path.join(output_dir, "done.txt"),
+                os.path.join(self.sub_dir, "thumbs.db"),
+            ]
+        )
+
+        result = fu.read_dir([Path(self.test_dir)])
+        assert sorted(result) == sorted(self.test_files)
+
+    def test_parallel_scan_matches_serial(self, private_tree):
+        """Listing levels on a thread pool finds the same files as serially."""
+        deep_dir = os.path.join(self.sub_dir, "a", "b")
+        os.makedirs(deep_dir)
+        os.makedirs(os.path.join(self.test_dir, "other"))
+        _touch_many(
+            os.path.join(directory, "part.7z.001")
+            for directory in (deep_dir, os.path.join(self.test_dir, "other"))
+        )
+
+        serial = fu.read_dir([self.test_dir], max_workers=1)
+        parallel = fu.read_dir([self.test_dir], max_workers=4)
+        assert len(serial) == 5
+        assert sorted(parallel) == sorted(serial)
+
 
 class TestRenameFile:
     """Tests for rename_file function."""
 
     def setup_method(self):
         """Set up test files."""
-        self.test_dir = tempfile.mkdtemp()
+        self._tmp = tempfile.TemporaryDirectory(ignore_cleanup_errors=True)
+        self.test_dir = self._tmp.name
         self.source_file = os.path.join(self.test_dir, "source.txt")
         self.target_file = os.path.join(self.test_dir, "target.txt")
 
+        # Content is read back after a replacing rename
         with open(self.source_file, "w") as f:
             f.write("test content")
 
     def teardown_method(self):
         """Clean up test files."""
-        shutil.rmtree(self.test_dir, ignore_errors=True)
+        self._tmp.cleanup()
 
     def test_successful_rename(self):
         """Test successful file rename."""
@@ -369,6 +437,16 @@ class TestRenameFile:
         assert os.path.exists(self.target_file)
         assert not os.path.exists(self.source_file)
 
+    def test_rename_replaces_existing_target(self):
+        """An existing target is replaced instead of failing."""
+        with open(self.target_file, "w") as f:
+            f.write("old content")
+        result = fu.rename_file(self.source_file, self.target_file)
+        assert result is True
+        with open(self.target_file) as f:
+            assert f.read() == "test content"
+        assert not os.path.exists(self.source_file)
+
     def test_rename_nonexistent_file(self):
         """Test renaming a nonexistent file."""
         callback_mock = Mock()
@@ -377,20 +455,22 @@ class TestRenameFile:
         callback_mock.assert_called_once()
         assert "Error renaming file" in callback_mock.call_args[0][0]
 
-    def test_rename_with_error_callback(self):
+    def test_rename_with_error_callback(self, monkeypatch):
         """Test rename with error callback."""
         # Make target directory read-only to cause permission error
         callback_mock = Mock()
         readonly_dir = os.path.join(self.test_dir, "readonly")
         os.makedirs(readonly_dir)
 
-        with patch("os.rename", side_effect=PermissionError("Permission denied")):
-            result = fu.rename_file(
-                self.source_file, os.path.join(readonly_dir, "test.txt"), callback_mock
-            )
-            assert result is False
-            callback_mock.assert_called_once()
-            assert "Permission denied" in callback_mock.call_args[0][0]
+        monkeypatch.setattr(
+            fu, "_replace", _raising(PermissionError("Permission denied"))
+        )
+        result = fu.rename_file(
+            self.source_file, os.path.join(readonly_dir, "test.txt"), callback_mock
+        )
+        assert result is False
+        callback_mock.assert_called_once()
+        assert "Permission denied" in callback_mock.call_args[0][0]
 
 
 class TestSafeRemove:
@@ -398,17 +478,16 @@ class TestSafeRemove:
 
     def setup_method(self):
         """Set up test files."""
-        self.test_dir = tempfile.mkdtemp()
+        self._tmp = tempfile.TemporaryDirectory(ignore_cleanup_errors=True)
+        self.test_dir = self._tmp.name
         self.test_file = os.path.join(self.test_dir, "test.txt")
-
-        with open(self.test_file, "w") as f:
-            f.write("test content")
+        _touch_many([self.test_file])
 
     def teardown_method(self):
         """Clean up test files."""
-        shutil.rmtree(self.test_dir, ignore_errors=True)
+        self._tmp.cleanup()
 
-    @patch("complex_unzip_tool_v2.modules.file_utils.send2trash")
+    @patch("send2trash.send2trash")
     def test_remove_to_recycle_bin(self, mock_send2trash):
         """Test removing file to recycle bin."""
         result = fu.safe_remove(self.test_file, use_recycle_bin=True)
@@ -421,22 +500,29 @@ class TestSafeRemove:
         assert result is True
         assert not os.path.exists(self.test_file)
 
+    def test_permanent_remove_does_not_import_send2trash(self):
+        """Permanent deletes never load send2trash."""
+        with patch.dict("sys.modules", {"send2trash": None}):
+            assert fu.safe_remove(self.test_file, use_recycle_bin=False) is True
+
     def test_remove_nonexistent_file(self):
         """Test removing nonexistent file."""
         result = fu.safe_remove("/nonexistent/file")
         assert result is False
 
-    def test_remove_with_error_callback(self):
+    def test_remove_with_error_callback(self, monkeypatch):
         """Test remove with error callback."""
         callback_mock = Mock()
 
-        with patch("os.remove", side_effect=PermissionError("Permission denied")):
-            result = fu.safe_remove(
-                self.test_file, use_recycle_bin=False, error_callback=callback_mock
-            )
-            assert result is False
-            callback_mock.assert_called_once()
-            assert "Permission denied" in callback_mock.call_args[0][0]
+        monkeypatch.setattr(
+            fu, "_remove", _raising(PermissionError("Permission denied"))
+        )
+        result = fu.safe_remove(
+            self.test_file, use_recycle_bin=False, error_callback=callback_mock
+        )
+        assert result is False
+        callback_mock.assert_called_once()
+        assert "Permission denied" in callback_mock.call_args[0][0]
 
 
 class TestShouldGroupFiles:
@@ -510,69 +596,80 @@ class TestShouldGroupFiles:
             is False
         )
 
+    def test_different_extensions_skip_similarity(self):
+        """Pairs of different archive types are rejected before any scoring."""
+        with patch.object(fu, "get_string_similarity") as mock_similarity:
+            assert not fu._should_group_files(
+                "dir-foo", "dir-foo", "/dir/foo.7z", "/dir/foo.zip"
+            )
+        mock_similarity.assert_not_called()
+
 
 class TestAreMultipartRelated:
     """Tests for _are_multipart_related function."""
 
-    @patch("complex_unzip_tool_v2.modules.file_utils.re.search")
-    def test_multipart_archives_same_base(self, mock_search):
+    @pytest.mark.parametrize(
+        "file1, file2",
+        [
+            ("/path/archive.7z.001", "/path/archive.7z.002"),
+            ("/path/archive.part1.rar", "/path/archive.part2.rar"),
+            ("/path/archive.z01", "/path/archive.z02"),
+            ("/path/archive.tar.gz.001", "/path/archive.tar.gz.002"),
+            ("/path/archive.iso.001", "/other/archive.iso.002"),
+        ],
+    )
+    def test_multipart_archives_same_base(self, file1, file2):
         """Test multipart archives with same base name."""
-        mock_search.return_value = True
-
-        with patch.object(fu, "get_archive_base_name") as mock_get_base:
-            mock_get_base.side_effect = [("archive", "7z"), ("archive", "7z")]
-            result = fu._are_multipart_related(
-                "/path/archive.7z.001", "/path/archive.7z.002"
-            )
-            assert result is True
-
-    @patch("complex_unzip_tool_v2.modules.file_utils.re.search")
-    def test_multipart_archives_different_base(self, mock_search):
+        assert fu._are_multipart_related(file1, file2) is True
+
+    @pytest.mark.parametrize(
+        "file1, file2",
+        [
+            ("/path/archive1.7z.001", "/path/archive2.7z.001"),
+            ("/path/archive.7z.001", "/path/archive.iso.001"),
+            ("/path/Archive.7z.001", "/path/archive.7z.002"),
+        ],
+    )
+    def test_multipart_archives_different_base(self, file1, file2):
         """Test multipart archives with different base names."""
-        mock_search.return_value = True
-
-        with patch.object(fu, "get_archive_base_name") as mock_get_base:
-            mock_get_base.side_effect = [("archive1", "7z"), ("archive2", "7z")]
-            result = fu._are_multipart_related(
-                "/path/archive1.7z.001", "/path/archive2.7z.001"
-            )
-            assert result is False
+        assert fu._are_multipart_related(file1, file2) is False
 
     def test_empty_comparison_file(self):
         """Test with empty comparison file."""
         result = fu._are_multipart_related("/path/archive.7z.001", "")
         assert result is False
 
-    @patch("complex_unzip_tool_v2.modules.file_utils.re.search")
-    def test_non_multipart_archives(self, mock_search):
+    def test_non_multipart_archives(self):
         """Test non-multipart archives."""
-        mock_search.return_value = False
         result = fu._are_multipart_related("/path/archive1.zip", "/path/archive2.zip")
         assert result is False
 
+    def test_suffix_only_matches_in_filename(self):
+        """A part-like directory name does not make a file multipart."""
+        result = fu._are_multipart_related(
+            "/path/set.7z.001/archive", "/path/set.7z.002/archive"
+        )
+        assert result is False
+
+    def test_base_names_only_parsed_for_multipart_pairs(self):
+        """Non-multipart pairs are rejected before any base-name parsing."""
+        with patch.object(fu, "get_archive_base_name") as mock_get_base:
+            assert not fu._are_multipart_related("/path/a.7z.001", "/path/a.zip")
+            mock_get_base.assert_not_called()
+
 
 class TestCreateGroupsByName:
     """Tests for create_groups_by_name function."""
 
     def setup_method(self):
-        """Set up test files."""
-        self.test_dir = tempfile.mkdtemp()
+        """Set up test paths; grouping never touches the disk."""
+        self.test_dir = os.path.join(os.sep, "archives")
         self.test_files = [
             os.path.join(self.test_dir, "archive1.zip"),
             os.path.join(self.test_dir, "archive2.7z"),
             os.path.join(self.test_dir, "data.rar"),
         ]
 
-        # Create the test files
-        for file_path in self.test_files:
-            with open(file_path, "wb") as f:
-                # Write some binary content that looks like a valid archive
-                f.write(b"PK\x03\x04")  # ZIP file signature
-
-    def teardown_method(self):
-        """Clean up test files."""
-        shutil.rmtree(self.test_dir, ignore_errors=True)
-
     def test_create_groups_basic(self):
         """Test basic group creation."""
         with patch.object(ArchiveGroup, "add_file"):
@@ -598,6 +695,45 @@ class TestCreateGroupsByName:
         groups = fu.create_groups_by_name(self.test_files)
         assert len(groups) > 0  # All files should result in groups
 
+    def test_only_groups_sharing_a_key_are_compared(self):
+        """Unrelated files never reach the pairwise comparison."""
+        files = [os.path.join(self.test_dir, f"file{i}.zip") for i in range(50)]
+        files += [
+            os.path.join(self.test_dir, "set.7z.001"),
+            os.path.join(self.test_dir, "set.7z.002"),
+        ]
+        with patch.object(
+            fu, "_should_group_files", wraps=fu._should_group_files
+        ) as mock_should_group:
+            groups = fu.create_groups_by_name(files)
+
+        assert len(groups) == 51
+        assert mock_should_group.call_count == 1
+        multipart = [g for g in groups if g.isMultiPart]
+        assert [len(g.files) for g in multipart] == [2]
+
+    def test_large_input_groups_without_similarity_scoring(self):
+        """Files only ever meet groups sharing a key, and equal group names are
+        accepted without scoring, so big inputs stay close to linear."""
+        files = []
+        for i in range(400):
+            files += [
+                os.path.join(os.sep, f"a{i}", "sub", f"set{i}.zip"),
+                os.path.join(os.sep, f"b{i}", "sub", f"set{i}.zip"),
+                os.path.join(os.sep, f"a{i}", f"vol{i}.7z.001"),
+            ]
+        with patch.object(
+            fu, "get_string_similarity", wraps=fu.get_string_similarity
+        ) as mock_similarity, patch.object(
+            fu, "_should_group_files", wraps=fu._should_group_files
+        ) as mock_should_group:
+            groups = fu.create_groups_by_name(files)
+
+        # Same-named .zip files under one folder name are merged by name
+        assert len(groups) == 800
+        assert mock_should_group.call_count == 400
+        mock_similarity.assert_not_called()
+
     def test_7z_not_merged_into_spanned_zip_group(self):
         """A standalone .7z sharing a base name with a spanned .zip set must
         stay in its own group, not get merged into the multipart zip group.
@@ -640,8 +776,10 @@ class TestMoveFilesPreservingStructure:
 
     def setup_method(self):
         """Set up test directory structure."""
-        self.source_dir = tempfile.mkdtemp()
-        self.dest_dir = tempfile.mkdtemp()
+        self._source_tmp = tempfile.TemporaryDirectory(ignore_cleanup_errors=True)
+        self._dest_tmp = tempfile.TemporaryDirectory(ignore_cleanup_errors=True)
+        self.source_dir = self._source_tmp.name
+        self.dest_dir = self._dest_tmp.name
 
         # Create nested directory structure
         self.subdir = os.path.join(self.source_dir, "subdir")
@@ -653,14 +791,12 @@ class TestMoveFilesPreservingStructure:
             os.path.join(self.subdir, "file2.txt"),
         ]
 
-        for file_path in self.test_files:
-            with open(file_path, "w") as f:
-                f.write("test content")
+        _touch_many(self.test_files)
 
     def teardown_method(self):
         """Clean up test directories."""
-        shutil.rmtree(self.source_dir, ignore_errors=True)
-        shutil.rmtree(self.dest_dir, ignore_errors=True)
+        self._source_tmp.cleanup()
+        self._dest_tmp.cleanup()
 
     def test_move_files_basic(self):
         """Test basic file moving with structure preservation."""
@@ -714,10 +850,35 @@ class TestMoveFilesPreservingStructure:
 
         assert len(result) == 1
         # Should have created file1_1.txt or similar
-        assert any(
-            os.path.exists(os.path.join(self.dest_dir, f"file1_{i}.txt"))
-            for i in range(1, 5)
-        )
+        renamed = {f"file1_{i}.txt" for i in range(1, 5)}
+        assert renamed & set(os.listdir(self.dest_dir))
+
+    def test_move_duplicates_checked_against_listing(self):
+        """Conflicts come from one listing per directory, and later files of
+        the same batch see the names taken by earlier ones."""
+        other_dir = os.path.join(self.source_dir, "other")
+        os.makedirs(other_dir)
+        other_file = os.path.join(other_dir, "file1.txt")
+        with open(other_file, "w") as f:
+            f.write("other content")
+        with open(os.path.join(self.dest_dir, "file1.txt"), "w") as f:
+            f.write("existing content")
+
+        with patch.object(fu, "normalize_output_relative_path", os.path.basename):
+            with patch("os.listdir", wraps=os.listdir) as mock_listdir:
+                result = fu.move_files_preserving_structure(
+                    [self.test_files[0], other_file], self.source_dir, self.dest_dir
+                )
+
+        assert result == ["file1.txt", "file1.txt"]
+        mock_listdir.assert_called_once_with(self.dest_dir)
+        assert sorted(os.listdir(self.dest_dir)) == [
+            "file1.txt",
+            "file1_1.txt",
+            "file1_2.txt",
+        ]
+        with open(os.path.join(self.dest_dir, "file1.txt")) as f:
+            assert f.read() == "existing content"
 
     def test_move_nonexistent_files(self):
         """Test moving nonexistent files."""
@@ -733,27 +894,49 @@ class TestMoveFilesPreservingStructure:
         assert len(result) == 0
         # Error callback should not be called for nonexistent files (they're just skipped)
 
-    def test_move_with_permission_error(self):
+    def test_move_same_device_renames_directly(self, monkeypatch):
+        """Moves on one device are plain renames; shutil.move is not needed."""
+        monkeypatch.setattr(fu, "_move", _raising(AssertionError("shutil.move used")))
+        result = fu.move_files_preserving_structure(
+            self.test_files, self.source_dir, self.dest_dir
+        )
+        assert len(result) == 2
+        assert os.path.exists(os.path.join(self.dest_dir, "file1.txt"))
+
+    def test_move_file_other_device_uses_shutil(self):
+        """A destination on another device falls back to shutil.move."""
+        destination = os.path.join(self.dest_dir, "file1.txt")
+        with patch.object(fu, "_move") as mock_move, patch.object(
+            fu, "_rename"
+        ) as mock_rename:
+            fu._move_file(self.test_files[0], destination, destination_dev=-1)
+        mock_rename.assert_not_called()
+        mock_move.assert_called_once_with(self.test_files[0], destination)
+
+    def test_move_with_permission_error(self, monkeypatch):
         """Test handling permission errors during move."""
         error_callback = Mock()
+        denied = _raising(PermissionError("Permission denied"))
+        monkeypatch.setattr(fu, "_rename", denied)
+        monkeypatch.setattr(fu, "_move", denied)
 
-        with patch("shutil.move", side_effect=PermissionError("Permission denied")):
-            result = fu.move_files_preserving_structure(
-                self.test_files,
-                self.source_dir,
-                self.dest_dir,
-                error_callback=error_callback,
-            )
+        result = fu.move_files_preserving_structure(
+            self.test_files,
+            self.source_dir,
+            self.dest_dir,
+            error_callback=error_callback,
+        )
 
-            assert len(result) == 0  # No files successfully moved
-            assert error_callback.call_count == 2  # Error called for each file
+        assert len(result) == 0  # No files successfully moved
+        assert error_callback.call_count == 2  # Error called for each file
 
 
 class TestAddFileToGroupsStrictMatching:
     """Regression tests for add_file_to_groups strict matching behavior."""
 
     def setup_method(self):
-        self.base_dir = tempfile.mkdtemp()
+        self._tmp = tempfile.TemporaryDirectory(ignore_cleanup_errors=True)
+        self.base_dir = self._tmp.name
         # Create two separate multipart groups with similar names but different bases
         self.group1_dir = os.path.join(self.base_dir, "A100")
         self.group2_dir = os.path.join(self.base_dir, "A101")
@@ -767,9 +950,7 @@ class TestAddFileToGroupsStrictMatching:
         self.g2_p1 = os.path.join(self.group2_dir, "B101.7z.001")
         self.g2_p2 = os.path.join(self.group2_dir, "B101.7z.002")
 
-        for p in [self.g1_p1, self.g1_p2, self.g2_p1, self.g2_p2]:
-            with open(p, "w") as f:
-                f.write("dummy")
+        _touch_many([self.g1_p1, self.g1_p2, self.g2_p1, self.g2_p2])
 
         # Build groups
         self.groups = []
@@ -782,17 +963,15 @@ class TestAddFileToGroupsStrictMatching:
         self.groups.append(g2)
 
     def teardown_method(self):
-        shutil.rmtree(self.base_dir, ignore_errors=True)
+        self._tmp.cleanup()
 
     def test_exact_base_name_is_required(self):
         """B100.7z.002 should join only B100 group, not B101 based on similarity."""
         added = fu.add_file_to_groups(self.g1_p2, self.groups)
         assert added is self.groups[0]
-        assert self.groups[0].files and any(
-            fp.endswith("B100.7z.002") for fp in self.groups[0].files
-        )
+        assert "B100.7z.002" in _basenames(self.groups[0].files)
         # Ensure it did not end up in the other group
-        assert not any(fp.endswith("B100.7z.002") for fp in self.groups[1].files)
+        assert "B100.7z.002" not in _basenames(self.groups[1].files)
 
     def test_no_group_on_different_base(self):
         """B101.7z.002 must not be added to B100 group despite similar naming."""
@@ -800,8 +979,7 @@ class TestAddFileToGroupsStrictMatching:
         groups_local = [self.groups[0]]  # only B100 group
         # Create a loose file resembling different base
         loose = os.path.join(self.group1_dir, "B101.7z.002")
-        with open(loose, "w") as f:
-            f.write("dummy")
+        _touch_many([loose])
 
         added = fu.add_file_to_groups(loose, groups_local)
         assert added is None
@@ -813,7 +991,8 @@ class TestAddFileToGroupsDirectoryAwareness:
     """Tests ensuring grouping only occurs within the same directory tree."""
 
     def setup_method(self):
-        self.base_dir = tempfile.mkdtemp()
+        self._tmp = tempfile.TemporaryDirectory(ignore_cleanup_errors=True)
+        self.base_dir = self._tmp.name
         # Create two separate sibling dirs
         self.dir_a = os.path.join(self.base_dir, "FolderA")
         self.dir_b = os.path.join(self.base_dir, "FolderB")
@@ -825,22 +1004,20 @@ class TestAddFileToGroupsDirectoryAwareness:
         self.a_p2 = os.path.join(self.dir_a, "Same.7z.002")
         self.b_p2 = os.path.join(self.dir_b, "Same.7z.002")
 
-        for p in [self.a_p1, self.a_p2, self.b_p2]:
-            with open(p, "w") as f:
-                f.write("dummy")
+        _touch_many([self.a_p1, self.a_p2, self.b_p2])
 
         # Group uses FolderA main archive
         self.group = ArchiveGroup("FolderA-Same")
         self.group.add_file(self.a_p1)
 
     def teardown_method(self):
-        shutil.rmtree(self.base_dir, ignore_errors=True)
+        self._tmp.cleanup()
 
     def test_group_same_folder(self):
         groups = [self.group]
         added = fu.add_file_to_groups(self.a_p2, groups)
         assert added is self.group
-        assert any(fp.endswith("Same.7z.002") for fp in self.group.files)
+        assert "Same.7z.002" in _basenames(self.group.files)
 
     def test_do_not_group_different_folder(self):
         groups = [self.group]
@@ -850,15 +1027,47 @@ class TestAddFileToGroupsDirectoryAwareness:
         assert os.path.exists(self.b_p2)
 
 
+_CONTAINED_PART_NAMES = (
+    "MySet.7z.001",
+    "MySet.7z.002",
+    "Set.zip",
+    "Set.z01",
+    "Standalone.zip",
+    "Arc.rar",
+    "Arc.r00",
+    "Standalone.rar",
+    "Set.iso.001",
+    "Set.iso.002",
+    "Lonely.rar.001",
+    "Z.zipx",
+    "Z.zx01",
+    "A.arj",
+    "A.a01",
+    "C.ace",
+    "C.c00",
+    "Solo.arj",
+    "Solo2.ace",
+)
+
+
+@pytest.fixture(scope="module")
+def contained_parts_dir(tmp_path_factory):
+    """Empty archive parts for the contained-group tests, created once.
+
+    ensure_contained_multipart_groups only looks at the paths it is given,
+    so every test picks its own files out of the one shared directory.
+    """
+    out_dir = tmp_path_factory.mktemp("unzipped")
+    _touch_many(str(out_dir / name) for name in _CONTAINED_PART_NAMES)
+    return out_dir
+
+
 class TestEnsureContainedMultipartGroups:
-    def test_creates_group_for_7z_set(self, tmp_path):
-        out_dir = tmp_path / "unzipped"
-        out_dir.mkdir(parents=True, exist_ok=True)
+    def test_creates_group_for_7z_set(self, contained_parts_dir):
+        out_dir = contained_parts_dir
 
         p1 = out_dir / "MySet.7z.001"
         p2 = out_dir / "MySet.7z.002"
-        p1.write_bytes(b"1")
-        p2.write_bytes(b"2")
 
         groups: list[ArchiveGroup] = []
         created = fu.ensure_contained_multipart_groups([str(p1), str(p2)], groups)
@@ -870,14 +1079,13 @@ class TestEnsureContainedMultipartGroups:
         assert os.path.basename(g.mainArchiveFile).lower().endswith(".7z.001")
         assert any(f.lower().endswith(".7z.002") for f in g.files)
 
-    def test_creates_group_for_spanned_zip_and_keeps_zip_as_main(self, tmp_path):
-        out_dir = tmp_path / "unzipped"
-        out_dir.mkdir(parents=True, exist_ok=True)
+    def test_creates_group_for_spanned_zip_and_keeps_zip_as_main(
+        self, contained_parts_dir
+    ):
+        out_dir = contained_parts_dir
 
         p_zip = out_dir / "Set.zip"
         p_z01 = out_dir / "Set.z01"
-        p_zip.write_bytes(b"zip")
-        p_z01.write_bytes(b"z01")
 
         groups: list[ArchiveGroup] = []
         created = fu.ensure_contained_multipart_groups([str(p_zip), str(p_z01)], groups)
@@ -889,12 +1097,10 @@ class TestEnsureContainedMultipartGroups:
         assert os.path.basename(g.mainArchiveFile).lower().endswith(".zip")
         assert any(f.lower().endswith(".z01") for f in g.files)
 
-    def test_does_not_create_group_for_standalone_zip(self, tmp_path):
-        out_dir = tmp_path / "unzipped"
-        out_dir.mkdir(parents=True, exist_ok=True)
+    def test_does_not_create_group_for_standalone_zip(self, contained_parts_dir):
+        out_dir = contained_parts_dir
 
         p_zip = out_dir / "Standalone.zip"
-        p_zip.write_bytes(b"zip")
 
         groups: list[ArchiveGroup] = []
         created = fu.ensure_contained_multipart_groups([str(p_zip)], groups)
@@ -902,14 +1108,13 @@ class TestEnsureContainedMultipartGroups:
         assert created == 0
         assert groups == []
 
-    def test_creates_group_for_rar_volume_and_keeps_rar_as_main(self, tmp_path):
-        out_dir = tmp_path / "unzipped"
-        out_dir.mkdir(parents=True, exist_ok=True)
+    def test_creates_group_for_rar_volume_and_keeps_rar_as_main(
+        self, contained_parts_dir
+    ):
+        out_dir = contained_parts_dir
 
         p_rar = out_dir / "Arc.rar"
         p_r00 = out_dir / "Arc.r00"
-        p_rar.write_bytes(b"rar")
-        p_r00.write_bytes(b"r00")
 
         groups: list[ArchiveGroup] = []
         created = fu.ensure_contained_multipart_groups([str(p_rar), str(p_r00)], groups)
@@ -921,12 +1126,10 @@ class TestEnsureContainedMultipartGroups:
         assert os.path.basename(g.mainArchiveFile).lower().endswith(".rar")
         assert any(f.lower().endswith(".r00") for f in g.files)
 
-    def test_does_not_create_group_for_standalone_rar(self, tmp_path):
-        out_dir = tmp_path / "unzipped"
-        out_dir.mkdir(parents=True, exist_ok=True)
+    def test_does_not_create_group_for_standalone_rar(self, contained_parts_dir):
+        out_dir = contained_parts_dir
 
         p_rar = out_dir / "Standalone.rar"
-        p_rar.write_bytes(b"rar")
 
         groups: list[ArchiveGroup] = []
         created = fu.ensure_contained_multipart_groups([str(p_rar)], groups)
@@ -934,14 +1137,11 @@ class TestEnsureContainedMultipartGroups:
         assert created == 0
         assert groups == []
 
-    def test_creates_group_for_generic_numbered_split(self, tmp_path):
-        out_dir = tmp_path / "unzipped"
-        out_dir.mkdir(parents=True, exist_ok=True)
+    def test_creates_group_for_generic_numbered_split(self, contained_parts_dir):
+        out_dir = contained_parts_dir
 
         p1 = out_dir / "Set.iso.001"
         p2 = out_dir / "Set.iso.002"
-        p1.write_bytes(b"1")
-        p2.write_bytes(b"2")
 
         groups: list[ArchiveGroup] = []
         created = fu.ensure_contained_multipart_groups([str(p1), str(p2)], groups)
@@ -952,13 +1152,13 @@ class TestEnsureContainedMultipartGroups:
         assert os.path.basename(g.mainArchiveFile).lower().endswith(".iso.001")
         assert any(f.lower().endswith(".iso.002") for f in g.files)
 
-    def test_creates_group_for_generic_numbered_split_from_001_alone(self, tmp_path):
+    def test_creates_group_for_generic_numbered_split_from_001_alone(
+        self, contained_parts_dir
+    ):
         # `.001` is unambiguous, so a group is created even without a sibling.
-        out_dir = tmp_path / "unzipped"
-        out_dir.mkdir(parents=True, exist_ok=True)
+        out_dir = contained_parts_dir
 
         p1 = out_dir / "Lonely.rar.001"
-        p1.write_bytes(b"1")
 
         groups: list[ArchiveGroup] = []
         created = fu.ensure_contained_multipart_groups([str(p1)], groups)
@@ -966,14 +1166,11 @@ class TestEnsureContainedMultipartGroups:
         assert created == 1
         assert os.path.basename(groups[0].mainArchiveFile).lower().endswith(".rar.001")
 
-    def test_creates_group_for_zipx_set(self, tmp_path):
-        out_dir = tmp_path / "unzipped"
-        out_dir.mkdir(parents=True, exist_ok=True)
+    def test_creates_group_for_zipx_set(self, contained_parts_dir):
+        out_dir = contained_parts_dir
 
         p_zipx = out_dir / "Z.zipx"
         p_zx01 = out_dir / "Z.zx01"
-        p_zipx.write_bytes(b"zipx")
-        p_zx01.write_bytes(b"zx01")
 
         groups: list[ArchiveGroup] = []
         created = fu.ensure_contained_multipart_groups(
@@ -985,14 +1182,11 @@ class TestEnsureContainedMultipartGroups:
         assert g.isMultiPart is True
         assert os.path.basename(g.mainArchiveFile).lower().endswith(".zipx")
 
-    def test_creates_group_for_arj_set(self, tmp_path):
-        out_dir = tmp_path / "unzipped"
-        out_dir.mkdir(parents=True, exist_ok=True)
+    def test_creates_group_for_arj_set(self, contained_parts_dir):
+        out_dir = contained_parts_dir
 
         p_arj = out_dir / "A.arj"
         p_a01 = out_dir / "A.a01"
-        p_arj.write_bytes(b"arj")
-        p_a01.write_bytes(b"a01")
 
         groups: list[ArchiveGroup] = []
         created = fu.ensure_contained_multipart_groups([str(p_arj), str(p_a01)], groups)
@@ -1000,14 +1194,11 @@ class TestEnsureContainedMultipartGroups:
         assert created == 1
         assert os.path.basename(groups[0].mainArchiveFile).lower().endswith(".arj")
 
-    def test_creates_group_for_ace_set(self, tmp_path):
-        out_dir = tmp_path / "unzipped"
-        out_dir.mkdir(parents=True, exist_ok=True)
+    def test_creates_group_for_ace_set(self, contained_parts_dir):
+        out_dir = contained_parts_dir
 
         p_ace = out_dir / "C.ace"
         p_c00 = out_dir / "C.c00"
-        p_ace.write_bytes(b"ace")
-        p_c00.write_bytes(b"c00")
 
         groups: list[ArchiveGroup] = []
         created = fu.ensure_contained_multipart_groups([str(p_ace), str(p_c00)], groups)
@@ -1015,14 +1206,11 @@ class TestEnsureContainedMultipartGroups:
         assert created == 1
         assert os.path.basename(groups[0].mainArchiveFile).lower().endswith(".ace")
 
-    def test_does_not_create_group_for_standalone_arj_or_ace(self, tmp_path):
-        out_dir = tmp_path / "unzipped"
-        out_dir.mkdir(parents=True, exist_ok=True)
+    def test_does_not_create_group_for_standalone_arj_or_ace(self, contained_parts_dir):
+        out_dir = contained_parts_dir
 
         p_arj = out_dir / "Solo.arj"
         p_ace = out_dir / "Solo2.ace"
-        p_arj.write_bytes(b"arj")
-        p_ace.write_bytes(b"ace")
 
         groups: list[ArchiveGroup] = []
         created = fu.ensure_contained_multipart_groups([str(p_arj), str(p_ace)], groups)
@@ -1139,5 +1327,20 @@ class TestOutputPathNormalization:
         assert len(files) == 2
 
 
+class TestUncloakFileExtensions:
+    """Tests for uncloak_file_extensions with the bundled rules."""
+
+    def test_default_rules_file_is_bundled(self):
+        assert os.path.isfile(fu.DEFAULT_CLOAKED_RULES_FILE)
+
+    def test_default_rules_found_from_any_cwd(self, tmp_path, monkeypatch):
+        """The default rules path does not depend on the working directory."""
+        monkeypatch.chdir(tmp_path)
+        target = tmp_path / "notes.txt"
+        target.write_bytes(b"plain text")
+
+        assert fu.uncloak_file_extensions([str(target)]) == [str(target)]
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
@@ -1,8 +1,33 @@
 import os
 
+import pytest
+from typer.testing import CliRunner
+
 import complex_unzip_tool_v2.main as main
 from complex_unzip_tool_v2.modules import const
 
+# extract_files reads/writes passwords.txt in the working directory and
+# stops early unless 7z is found
+pytestmark = pytest.mark.usefixtures("isolated_cwd", "seven_zip_present")
+
+# CLI tests invoke the Typer app in-process through one shared runner
+runner = CliRunner()
+
+
+def _nested_result(success: bool = True, **fields) -> dict:
+    """A result dict as returned by archive_utils.extract_nested_archives."""
+    result = {
+        "success": success,
+        "final_files": [],
+        "extracted_archives": [],
+        "errors": [],
+        "password_failed_archives": [],
+        "user_provided_passwords": [],
+        "password_used": {},
+    }
+    result.update(fields)
+    return result
+
 
 def test_contained_multipart_parts_preserved_to_output_when_extraction_fails(
     monkeypatch, tmp_path
@@ -60,6 +85,60 @@ def test_contained_multipart_parts_preserved_to_output_when_extraction_fails(
     assert found_002 is True
 
 
+# ---------------------------------------------------------------------------
+# Command line, invoked in-process (no interpreter start-up per test)
+# ---------------------------------------------------------------------------
+
+
+def test_help_display():
+    result = runner.invoke(main.app, ["--help"])
+    assert result.exit_code == 0
+    assert "Complex Unzip Tool v2" in result.output
+    assert "--permanent-delete" in result.output
+
+
+def test_no_args_shows_help_and_waits_for_exit(monkeypatch):
+    exits = []
+    monkeypatch.setattr(main, "_ask_for_user_input_and_exit", lambda: exits.append(1))
+    monkeypatch.setattr(
+        main, "extract_files", lambda *a, **k: pytest.fail("nothing to extract")
+    )
+
+    result = runner.invoke(main.app, [])
+
+    assert result.exit_code == 0
+    assert "Usage" in result.output
+    assert exits == [1]
+
+
+@pytest.mark.parametrize("args, verbose", [([], False), (["--verbose"], True)])
+def test_verbose_option_reaches_extract_files(monkeypatch, tmp_path, args, verbose):
+    calls = []
+    monkeypatch.setattr(main, "extract_files", lambda *a, **k: calls.append(k))
+
+    result = runner.invoke(main.app, [*args, str(tmp_path)])
+
+    assert result.exit_code == 0
+    assert calls == [{"use_recycle_bin": True, "verbose": verbose}]
+
+
+def test_missing_7z_exits_with_error_after_rename_recovery(monkeypatch, tmp_path):
+    recovered = []
+    monkeypatch.setattr(main, "_maybe_recover_pending_renames", recovered.append)
+    monkeypatch.setattr(main.archive_utils, "seven_zip_available", lambda: False)
+    monkeypatch.setattr(
+        main.file_utils, "read_dir", lambda *a, **k: pytest.fail("scanned anyway")
+    )
+
+    with pytest.raises(SystemExit) as exc_info:
+        main.extract_files([str(tmp_path)], use_recycle_bin=False)
+
+    assert exc_info.value.code == 1
+    # Recovering a crashed run's renames does not need 7z
+    assert recovered == [str(tmp_path)]
+    assert not (tmp_path / const.OUTPUT_FOLDER).exists()
+
+
 def test_should_delete_original_archives_false_when_password_failed_archives_present():
     assert (
         main._should_delete_original_archives(
@@ -105,26 +184,10 @@ def test_step7_autogroups_contained_zip_spanned_and_step8_processes_it(
                 f.write(b"zip")
             with open(p_z01, "wb") as f:
                 f.write(b"z01")
-            return {
-                "success": True,
-                "final_files": [p_zip, p_z01],
-                "extracted_archives": [],
-                "errors": [],
-                "password_failed_archives": [],
-                "user_provided_passwords": [],
-                "password_used": {},
-            }
+            return _nested_result(final_files=[p_zip, p_z01])
 
         # For the contained set (Step 8), just report success.
-        return {
-            "success": True,
-            "final_files": [],
-            "extracted_archives": [],
-            "errors": [],
-            "password_failed_archives": [],
-            "user_provided_passwords": [],
-            "password_used": {},
-        }
+        return _nested_result()
 
     monkeypatch.setattr(
         main.archive_utils, "extract_nested_archives", fake_extract_nested_archives
@@ -177,15 +240,7 @@ def test_rename_history_reverts_on_extraction_failure(monkeypatch, tmp_path):
     monkeypatch.setattr(main.file_utils, "uncloak_file_extensions", fake_uncloak)
 
     # Stub extraction to always fail.
-    failure_result = {
-        "success": False,
-        "final_files": [],
-        "extracted_archives": [],
-        "errors": ["forced failure"],
-        "password_failed_archives": [],
-        "user_provided_passwords": [],
-        "password_used": {},
-    }
+    failure_result = _nested_result(False, errors=["forced failure"])
     monkeypatch.setattr(
         main.archive_utils, "extract_nested_archives", lambda *a, **k: failure_result
     )
@@ -228,15 +283,7 @@ def test_rename_history_cleared_on_extraction_success(monkeypatch, tmp_path):
     monkeypatch.setattr(main.file_utils, "uncloak_file_extensions", fake_uncloak)
 
     # Stub extraction to succeed (no nested files needed for Step 7 success).
-    success_result = {
-        "success": True,
-        "final_files": [],
-        "extracted_archives": [],
-        "errors": [],
-        "password_failed_archives": [],
-        "user_provided_passwords": [],
-        "password_used": {},
-    }
+    success_result = _nested_result()
     monkeypatch.setattr(
         main.archive_utils, "extract_nested_archives", lambda *a, **k: success_result
     )
@@ -256,8 +303,10 @@ def test_rename_history_cleared_on_extraction_success(monkeypatch, tmp_path):
     assert not (tmp_path / HISTORY_FILENAME).exists()
 
 
-def test_rename_history_recovery_prompt_yes_reverts(monkeypatch, tmp_path):
-    """A leftover history file from a previous run can be reverted on prompt 'y'."""
+@pytest.mark.parametrize("answer", ["y", "n"])
+def test_rename_history_recovery_prompt(monkeypatch, tmp_path, answer):
+    """A leftover history file from a previous run is reverted on prompt 'y';
+    answering 'n' leaves the renamed file in place."""
     from complex_unzip_tool_v2.modules.rename_history import (
         HISTORY_FILENAME,
         RenameHistory,
@@ -274,74 +323,28 @@ def test_rename_history_recovery_prompt_yes_reverts(monkeypatch, tmp_path):
 
     assert (tmp_path / HISTORY_FILENAME).exists()
 
-    # Patch input() to answer 'y' to the recovery prompt.
-    monkeypatch.setattr("builtins.input", lambda *a, **k: "y")
+    # Patch input() to answer the recovery prompt.
+    monkeypatch.setattr("builtins.input", lambda *a, **k: answer)
     monkeypatch.setattr(main, "_ask_for_user_input_and_exit", lambda: None)
     # No-op extraction so we just exercise the recovery path.
     monkeypatch.setattr(
-        main.archive_utils,
-        "extract_nested_archives",
-        lambda *a, **k: {
-            "success": True,
-            "final_files": [],
-            "extracted_archives": [],
-            "errors": [],
-            "password_failed_archives": [],
-            "user_provided_passwords": [],
-            "password_used": {},
-        },
+        main.archive_utils, "extract_nested_archives", lambda *a, **k: _nested_result()
     )
     monkeypatch.setattr(main.file_utils, "safe_remove", lambda *a, **k: False)
-    monkeypatch.setattr(main.file_utils, "uncloak_file_extensions", lambda paths, **k: paths)
-
-    main.extract_files([str(tmp_path)], use_recycle_bin=False)
-
-    # Recovery happened: original restored, renamed gone
-    assert original.exists()
-    assert not renamed.exists()
-    # The leftover history file was deleted (recovery path) and the new run
-    # did not create a fresh one (no records during run).
-    assert not (tmp_path / HISTORY_FILENAME).exists()
-
-
-def test_rename_history_recovery_prompt_no_keeps_file(monkeypatch, tmp_path):
-    """Answering 'n' to recovery leaves the renamed file in place."""
-    from complex_unzip_tool_v2.modules.rename_history import (
-        HISTORY_FILENAME,
-        RenameHistory,
-    )
-
-    renamed = tmp_path / "leftover.7z.001"
-    original = tmp_path / "leftover.bin"
-    renamed.write_bytes(b"data")
-
-    h = RenameHistory(str(tmp_path))
-    h.record(str(original), str(renamed))
-    h.bind(str(renamed), "previous-run-group")
-
-    monkeypatch.setattr("builtins.input", lambda *a, **k: "n")
-    monkeypatch.setattr(main, "_ask_for_user_input_and_exit", lambda: None)
     monkeypatch.setattr(
-        main.archive_utils,
-        "extract_nested_archives",
-        lambda *a, **k: {
-            "success": True,
-            "final_files": [],
-            "extracted_archives": [],
-            "errors": [],
-            "password_failed_archives": [],
-            "user_provided_passwords": [],
-            "password_used": {},
-        },
+        main.file_utils, "uncloak_file_extensions", lambda paths, **k: paths
     )
-    monkeypatch.setattr(main.file_utils, "safe_remove", lambda *a, **k: False)
-    monkeypatch.setattr(main.file_utils, "uncloak_file_extensions", lambda paths, **k: paths)
 
     main.extract_files([str(tmp_path)], use_recycle_bin=False)
 
-    # Renamed kept, original not restored
-    assert renamed.exists()
-    assert not original.exists()
-    # History file deleted by finalize() since the new run did not record anything
-    # (so the in-memory history was empty by end of run)
+    if answer == "y":
+        # Recovery happened: original restored, renamed gone
+        assert original.exists()
+        assert not renamed.exists()
+    else:
+        # Renamed kept, original not restored
+        assert renamed.exists()
+        assert not original.exists()
+    # The leftover history file was deleted (by recovery, or by finalize()) and
+    # the new run did not create a fresh one (no records during run).
     assert not (tmp_path / HISTORY_FILENAME).exists()
@@ -0,0 +1,97 @@
+"""Unit tests for PasswordBook and password_util."""
+
+import os
+
+import pytest
+
+from complex_unzip_tool_v2.classes import PasswordBook as password_book_module
+from complex_unzip_tool_v2.classes.PasswordBook import PasswordBook
+from complex_unzip_tool_v2.modules import password_util
+
+
+@pytest.fixture
+def book(tmp_path, monkeypatch):
+    """A PasswordBook whose local passwords.txt lives in an empty tmp_path."""
+    monkeypatch.chdir(tmp_path)
+    password_book_module._read_password_file.cache_clear()
+    return PasswordBook()
+
+
+@pytest.mark.parametrize(
+    "encoding, text",
+    [
+        ("utf-8-sig", "first\r\n\r\n  密码  \n"),
+        ("gbk", "first\n密码\n"),
+        ("utf-16", "first\n密码\n"),
+    ],
+)
+def test_load_passwords_decodes_and_trims(book, tmp_path, encoding, text):
+    password_file = tmp_path / "dest.txt"
+    password_file.write_bytes(text.encode(encoding))
+
+    book.load_passwords(str(password_file))
+
+    assert sorted(book.dest_entries) == sorted(["first", "密码"])
+
+
+def test_load_passwords_missing_file(book, tmp_path):
+    book.load_passwords(str(tmp_path / "missing.txt"))
+    assert book.dest_entries == []
+
+
+def test_unchanged_file_is_parsed_once(book, tmp_path):
+    password_file = tmp_path / "dest.txt"
+    password_file.write_text("a\nb\n", encoding="utf-8")
+
+    book.load_passwords(str(password_file))
+    PasswordBook().load_passwords(str(password_file))
+
+    info = password_book_module._read_password_file.cache_info()
+    assert info.hits == 1 and info.misses == 1
+
+
+def test_edited_file_is_parsed_again(book, tmp_path):
+    password_file = tmp_path / "dest.txt"
+    password_file.write_text("a\n", encoding="utf-8")
+    book.load_passwords(str(password_file))
+
+    password_file.write_text("a\nbb\n", encoding="utf-8")
+    book.load_passwords(str(password_file))
+
+    assert sorted(book.dest_entries) == ["a", "bb"]
+
+
+def test_load_all_passwords_reads_each_folder_once(book, tmp_path, monkeypatch):
+    (tmp_path / "passwords.txt").write_text("secret\n", encoding="utf-8")
+    inputs = [str(tmp_path / f"a.7z.00{i}") for i in range(1, 4)] + [str(tmp_path)]
+
+    loaded = []
+    original = PasswordBook.load_passwords
+
+    def spy(self, path, is_local=False):
+        loaded.append((path, is_local))
+        original(self, path, is_local)
+
+    monkeypatch.setattr(PasswordBook, "load_passwords", spy)
+    result = password_util.load_all_passwords(inputs)
+
+    assert loaded.count((os.path.join(str(tmp_path), "passwords.txt"), False)) == 1
+    assert "secret" in result.get_passwords()
+
+
+def test_load_all_passwords_reads_folders_concurrently(book, tmp_path):
+    inputs = []
+    for index in range(5):
+        folder = tmp_path / f"folder{index}"
+        folder.mkdir()
+        (folder / "passwords.txt").write_text(f"pw{index}\n", encoding="utf-8")
+        inputs.append(str(folder / "a.7z"))
+    password_book_module._read_password_file.cache_clear()
+
+    serial = password_util.load_all_passwords(inputs, max_workers=1)
+    parallel = password_util.load_all_passwords(inputs, max_workers=4)
+
+    assert sorted(parallel.get_passwords()) == [f"pw{i}" for i in range(5)]
+    assert sorted(parallel.get_passwords()) == sorted(serial.get_passwords())
+    # Each file was parsed once; the pooled reads were served from the cache
+    assert password_book_module._read_password_file.cache_info().misses == 5
@@ -2,79 +2,92 @@
 
 import re
 
+import pytest
+
 from complex_unzip_tool_v2.modules.regex import multipart_regex, first_part_regex
 
+MULTIPART_RE = re.compile(multipart_regex, re.IGNORECASE)
+FIRST_PART_RE = re.compile(first_part_regex, re.IGNORECASE)
+
+EXISTING_MULTIPART_NAMES = [
+    "a.7z.001",
+    "a.7z.002",
+    "a.tar.gz.001",
+    "a.tar.bz2.002",
+    "a.z01",
+    "a.r00",
+    "a.part1.rar",
+    "a.part2.rar",
+]
+GENERIC_SPLIT_NAMES = [
+    "a.zip.001",
+    "a.zip.002",
+    "a.rar.001",
+    "a.iso.001",
+    "a.bin.002",
+    "a.tar.001",
+]
+OTHER_CONTINUATION_NAMES = ["a.zx01", "a.zx02", "a.a01", "a.a02", "a.c00", "a.c01"]
+# Standalone primaries and ordinary files are not continuations.
+NON_MULTIPART_NAMES = [
+    "a.zip",
+    "a.7z",
+    "a.rar",
+    "a.zipx",
+    "a.arj",
+    "a.ace",
+    "movie.mp4",
+    "a.001",  # bare numeric, no archive token before the number
+]
+# Only zero-padded 3+ digit volume suffixes count (what 7-Zip emits).
+SHORT_NUMERIC_SUFFIX_NAMES = ["a.zip.1", "a.zip.01", "a.iso.1"]
+
 
 def _is_multipart(name: str) -> bool:
-    return bool(re.search(multipart_regex, name, re.IGNORECASE))
+    return bool(MULTIPART_RE.search(name))
 
 
 def _is_first_part(name: str) -> bool:
-    return bool(re.search(first_part_regex, name, re.IGNORECASE))
+    return bool(FIRST_PART_RE.search(name))
 
 
 class TestMultipartRegex:
     """multipart_regex must match every supported continuation/volume form."""
 
-    def test_existing_formats_still_match(self):
-        for name in [
-            "a.7z.001",
-            "a.7z.002",
-            "a.tar.gz.001",
-            "a.tar.bz2.002",
-            "a.z01",
-            "a.r00",
-            "a.part1.rar",
-            "a.part2.rar",
-        ]:
-            assert _is_multipart(name), name
-
-    def test_generic_numbered_split_any_extension(self):
-        for name in [
-            "a.zip.001",
-            "a.zip.002",
-            "a.rar.001",
-            "a.iso.001",
-            "a.bin.002",
-            "a.tar.001",
-        ]:
-            assert _is_multipart(name), name
-
-    def test_zipx_arj_ace_continuations_match(self):
-        for name in ["a.zx01", "a.zx02", "a.a01", "a.a02", "a.c00", "a.c01"]:
-            assert _is_multipart(name), name
-
-    def test_non_multipart_names_do_not_match(self):
-        # Standalone primaries and ordinary files are not continuations.
-        for name in [
-            "a.zip",
-            "a.7z",
-            "a.rar",
-            "a.zipx",
-            "a.arj",
-            "a.ace",
-            "movie.mp4",
-            "a.001",  # bare numeric, no archive token before the number
-        ]:
-            assert not _is_multipart(name), name
-
-    def test_one_and_two_digit_numeric_suffix_not_multipart(self):
-        # Only zero-padded 3+ digit volume suffixes count (what 7-Zip emits).
-        for name in ["a.zip.1", "a.zip.01", "a.iso.1"]:
-            assert not _is_multipart(name), name
+    @pytest.mark.parametrize("name", EXISTING_MULTIPART_NAMES)
+    def test_existing_formats_still_match(self, name):
+        assert _is_multipart(name)
+
+    @pytest.mark.parametrize("name", GENERIC_SPLIT_NAMES)
+    def test_generic_numbered_split_any_extension(self, name):
+        assert _is_multipart(name)
+
+    @pytest.mark.parametrize("name", OTHER_CONTINUATION_NAMES)
+    def test_zipx_arj_ace_continuations_match(self, name):
+        assert _is_multipart(name)
+
+    @pytest.mark.parametrize("name", NON_MULTIPART_NAMES)
+    def test_non_multipart_names_do_not_match(self, name):
+        assert not _is_multipart(name)
+
+    @pytest.mark.parametrize("name", SHORT_NUMERIC_SUFFIX_NAMES)
+    def test_one_and_two_digit_numeric_suffix_not_multipart(self, name):
+        assert not _is_multipart(name)
 
 
 class TestFirstPartRegex:
     """first_part_regex marks only the unambiguous numbered entry point."""
 
-    def test_existing_first_parts_match(self):
-        for name in ["a.7z.001", "a.tar.gz.001", "a.part1.rar"]:
-            assert _is_first_part(name), name
+    @pytest.mark.parametrize("name", ["a.7z.001", "a.tar.gz.001", "a.part1.rar"])
+    def test_existing_first_parts_match(self, name):
+        assert _is_first_part(name)
 
-    def test_generic_numbered_first_part_matches(self):
-        for name in ["a.zip.001", "a.rar.001", "a.iso.001"]:
-            assert _is_first_part(name), name
+    @pytest.mark.parametrize("name", ["a.zip.001", "a.rar.001", "a.iso.001"])
+    def test_generic_numbered_first_part_matches(self, name):
+        assert _is_first_part(name)
 
-    def test_continuations_are_not_first_parts(self):
-        for name in ["a.zip.002", "a.7z.002", "a.z01", "a.r00", "a.part2.rar"]:
-            assert not _is_first_part(name), name
+    @pytest.mark.parametrize(
+        "name", ["a.zip.002", "a.7z.002", "a.z01", "a.r00", "a.part2.rar"]
+    )
+    def test_continuations_are_not_first_parts(self, name):
+        assert not _is_first_part(name)
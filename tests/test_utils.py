@@ -0,0 +1,61 @@
+"""Unit tests for utils module."""
+
+import os
+
+import pytest
+
+from complex_unzip_tool_v2.modules.utils import (
+    get_string_similarity,
+    sanitize_filename,
+    sanitize_path,
+)
+
+
+@pytest.mark.parametrize(
+    "filename, expected",
+    [
+        ("", "unnamed"),
+        ('a<b>c:"d|e?f*.txt', "a_b_c__d_e_f_.txt"),
+        ("CON.txt", "_CON.txt"),
+        ("lpt9", "_lpt9"),
+        ("COM10.txt", "COM10.txt"),
+        (" .name. ", "name"),
+        ("...", "unnamed"),
+    ],
+)
+def test_sanitize_filename(filename, expected):
+    assert sanitize_filename(filename) == expected
+
+
+def test_sanitize_filename_truncation_keeps_extension():
+    assert sanitize_filename("a" * 20 + ".zip", max_length=10) == "aaaaaa.zip"
+
+
+def test_sanitize_path_reuses_component_results():
+    sanitize_filename.cache_clear()
+    sanitize_path(os.path.join("top", "mid", "leaf1"))
+    sanitize_path(os.path.join("top", "mid", "leaf2"))
+    # "top" and "mid" are sanitized once for both paths
+    assert sanitize_filename.cache_info().hits == 2
+
+
+@pytest.mark.parametrize(
+    "str1, str2",
+    [
+        ("archive1.zip", "archive2.zip"),
+        ("Archive", "archive"),
+        ("abc", "xyz"),
+        ("dir-set", "dir-set-extra-long-name"),
+        ("", ""),
+        ("a", ""),
+    ],
+)
+@pytest.mark.parametrize("min_ratio", [0.5, 0.8, 0.95])
+def test_similarity_threshold_matches_exact_ratio(str1, str2, min_ratio):
+    """Early exits on the upper bounds never change the threshold decision."""
+    exact = get_string_similarity(str1, str2)
+    assert (get_string_similarity(str1, str2, min_ratio) >= min_ratio) == (
+        exact >= min_ratio
+    )
+    if exact >= min_ratio:
+        assert get_string_similarity(str1, str2, min_ratio) == exact